@@ -6,8 +6,15 @@
 # A fake device driver library that simulates the CedarGrove NAU7802 24-bit
 #   ADC FeatherWing, used for code testing without a connected wing.
 
+import math
 import time
 import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Bulk generation falls back to sample-by-sample
 
 
 class LDOVoltage:
@@ -41,11 +48,118 @@ class CalibrationMode:
     GAIN = 0x3  # Gain   Calibration System;   _CTRL2[1:0] = 3
 
 
+# ConversionRate setting and analog multiplexer settling time in seconds
+_CONV_RATES = {
+    10: (ConversionRate.RATE_10SPS, 0.400),
+    20: (ConversionRate.RATE_20SPS, 0.200),
+    40: (ConversionRate.RATE_40SPS, 0.100),
+    80: (ConversionRate.RATE_80SPS, 0.050),
+    320: (ConversionRate.RATE_320SPS, 0.020),
+}
+
+# Register field settings for each LDO voltage, gain factor, and calibration
+# mode
+_LDO_VOLTAGES = {
+    "2V4": LDOVoltage.LDO_2V4,
+    "2V7": LDOVoltage.LDO_2V7,
+    "3V0": LDOVoltage.LDO_3V0,
+}
+_GAINS = {1 << setting: setting for setting in range(8)}
+_CALIBRATION_MODES = {
+    "INTERNAL": CalibrationMode.INTERNAL,
+    "OFFSET": CalibrationMode.OFFSET,
+    "GAIN": CalibrationMode.GAIN,
+}
+
+# Full-scale limits of the signed 24-bit conversion value
+_FULL_SCALE = (-0x800000, 0x7FFFFF)
+
+
+class SignalModel:
+    """Seeded load cell signal model for one channel, in ADC counts at gain
+    128 and 10 SPS. The signal is level plus the load changes in steps, a
+    sequence of (seconds, change) tuples that each settle exponentially with
+    time constant tau seconds, plus a thermal drift that approaches drift
+    counts with time constant drift_tau seconds. sample() and generate() scale
+    the signal by gain / 128, add Gaussian noise with a standard deviation of
+    noise counts scaled by gain / 128 and the square root of rate / 10, and
+    saturate at the 24-bit full scale. Calling the model returns the
+    noiseless signal, so a model can also be a FakeNAU7802Device input.
+    The noise of both sample() and generate() is drawn from one seeded
+    sequence of standard normal values, so a seed gives the same
+    conversions whichever method reads them and whether or not NumPy is
+    installed."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, level=0, steps=(), tau=0.2, noise=0, drift=0, drift_tau=600, seed=None
+    ):
+        self.level = level
+        self.steps = tuple(steps)
+        self.tau = tau
+        self.noise = noise
+        self.drift = drift
+        self.drift_tau = drift_tau
+        self.seed = seed
+        self._random = random.Random(seed)  # The only noise source
+
+    def __call__(self, seconds):
+        value = self.level
+        for start, change in self.steps:
+            if seconds >= start:
+                value += change * (1 - math.exp((start - seconds) / self.tau))
+        if self.drift:
+            value += self.drift * (1 - math.exp(-seconds / self.drift_tau))
+        return value
+
+    def _sigma(self, gain, rate):
+        return self.noise * gain / 128 * math.sqrt(rate / 10)
+
+    def sample(self, seconds, gain=128, rate=10):
+        """One conversion value at seconds as a float."""
+        value = self(seconds) * gain / 128
+        if self.noise:
+            value += self._random.gauss(0, 1) * self._sigma(gain, rate)
+        return min(max(value, _FULL_SCALE[0]), _FULL_SCALE[1])
+
+    def generate(self, seconds, count, gain=128, rate=10):
+        """count consecutive conversion values starting at seconds, one per
+        conversion period. Returns a float64 NumPy array, or a list of floats
+        when NumPy is not available."""
+        if np is None:
+            return [self.sample(seconds + i / rate, gain, rate) for i in range(count)]
+        # Same expressions as __call__() and sample(), evaluated on arrays
+        times = seconds + np.arange(count) / rate
+        values = np.full(count, float(self.level))
+        for start, change in self.steps:
+            settled = 1 - np.exp(np.minimum(start - times, 0) / self.tau)
+            values += change * np.where(times >= start, settled, 0)
+        if self.drift:
+            values += self.drift * (1 - np.exp(-times / self.drift_tau))
+        values = values * gain / 128
+        if self.noise:
+            gauss = self._random.gauss
+            noise = np.fromiter((gauss(0, 1) for _ in range(count)), float, count)
+            values += noise * self._sigma(gain, rate)
+        return np.clip(values, _FULL_SCALE[0], _FULL_SCALE[1])
+
+
 class FakeNAU7802:
-    def __init__(self, i2c_bus, address=0x2A, active_channels=1):
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        i2c_bus,
+        address=0x2A,
+        active_channels=1,
+        warm=False,
+        drdy=None,
+        models=None,
+    ):
         """Instantiate NAU7802; LDO 3v0 volts, gain 128, 10 samples per second
         conversion rate, disabled ADC chopper clock, low ESR caps, and PGA output
-        stabilizer cap if in single channel mode. Returns True if successful."""
+        stabilizer cap if in single channel mode. Returns True if successful.
+        models holds a SignalModel for channels 1 and 2; defaults to a zero
+        load with 20 counts of noise."""
         # self.i2c_device = I2CDevice(i2c_bus, address)
         if not self.reset():
             raise RuntimeError("NAU7802 device could not be reset")
@@ -56,7 +170,7 @@ class FakeNAU7802:
         self.ldo_voltage = "3V0"  # 3.0-volt internal analog power (AVDD)
         self._pu_ldo_source = True  # Internal analog power (AVDD)
         self.gain = 128  # X128
-        self._c2_conv_rate = ConversionRate.RATE_10SPS  # 10 SPS; default
+        self.conversion_rate = 10  # 10 SPS; default
         self._adc_chop_clock = 0x3  # 0x3 = Disable ADC chopper clock
         self._pga_ldo_mode = 0x0  # 0x0 = Use low ESR capacitors
         self._act_channels = active_channels
@@ -67,6 +181,17 @@ class FakeNAU7802:
             self._pc_cap_enable = (
                 0x0  # 0x0 = Disable PGA out stabilizer cap for dual channel use
             )
+        if models is None:
+            models = (SignalModel(noise=20), SignalModel(noise=20))
+        self.models = list(models)
+        self._c2_chan_select = 0x0
+        self._sim_time = 0.0  # Time of the next conversion in seconds
+        self._switch_at = None  # Time of the last channel change
+        self._switch_from = 0  # Signal value before the last channel change
+        self._strict = None
+        self.reset_sample_counts()
+        self._cal_started = None
+        self._cal_ended = None
 
     @property
     def chip_revision(self):
@@ -85,17 +210,49 @@ class FakeNAU7802:
         Analog multiplexer settling time was emperically determined to be
         approximately 400ms at 10SPS, 200ms at 20SPS, 100ms at 40SPS,
         50ms at 80SPS, and 20ms at 320SPS."""
-        if chan == 1:
-            self._c2_chan_select = 0x0
-            time.sleep(0.400)  # 400ms settling time for 10SPS
-        elif chan == 2 and self._act_channels == 2:
-            self._c2_chan_select = 0x1
-            time.sleep(0.400)  # 400ms settling time for 10SPS
-        else:
+        self._select_channel(chan)
+        time.sleep(self.settling_time)
+        self._sim_time += self.settling_time
+        return
+
+    def _select_channel(self, chan):
+        """Select the channel without waiting for the settling time. The
+        previous channel's signal decays from subsequent conversions during
+        the settling time."""
+        if not (chan == 1 or (chan == 2 and self._act_channels == 2)):
             raise ValueError("Invalid Channel Number")
+        if chan - 1 != self._c2_chan_select:
+            self._switch_from = self.models[self._c2_chan_select](self._sim_time)
+            self._switch_at = self._sim_time
+        self._c2_chan_select = chan - 1
+
+    @property
+    def conversion_rate(self):
+        """The ADC conversion rate in samples per second."""
+        return self._conversion_rate
+
+    @conversion_rate.setter
+    def conversion_rate(self, rate=10):
+        """Select the ADC conversion rate. Valid rates are 10, 20, 40, 80, and
+        320 samples per second."""
+        if rate not in _CONV_RATES:
+            raise ValueError("Invalid Conversion Rate")
             return
+        self._conversion_rate = rate
+        self._c2_conv_rate = _CONV_RATES[rate][0]
         return
 
+    @property
+    def settling_time(self):
+        """The analog multiplexer settling time in seconds for the current
+        conversion rate."""
+        return _CONV_RATES[self._conversion_rate][1]
+
+    @property
+    def settling_conversions(self):
+        """The number of conversions to discard after a channel change."""
+        return -(-int(self.settling_time * 1000) * self._conversion_rate // 1000)
+
     @property
     def ldo_voltage(self):
         """Representation of the LDO voltage value."""
@@ -104,17 +261,10 @@ class FakeNAU7802:
     @ldo_voltage.setter
     def ldo_voltage(self, voltage="EXTERNAL"):
         """Select the LDO Voltage. Valid voltages are '2V4', '2V7', '3V0'."""
-        if not ("LDO_" + voltage in dir(LDOVoltage)):
+        if voltage not in _LDO_VOLTAGES:
             raise ValueError("Invalid LDO Voltage")
-            return
         self._ldo_voltage = voltage
-        if self._ldo_voltage == "2V4":
-            self._c1_vldo_volts = LDOVoltage.LDO_2V4
-        elif self._ldo_voltage == "2V7":
-            self._c1_vldo_volts = LDOVoltage.LDO_2V7
-        elif self._ldo_voltage == "3V0":
-            self._c1_vldo_volts = LDOVoltage.LDO_3V0
-        return
+        self._c1_vldo_volts = _LDO_VOLTAGES[voltage]
 
     @property
     def gain(self):
@@ -125,35 +275,18 @@ class FakeNAU7802:
     def gain(self, factor=1):
         """Select PGA gain factor. Valid values are '1, 2, 4, 8, 16, 32, 64,
         and 128."""
-        if not ("GAIN_X" + str(factor) in dir(Gain)):
+        if factor not in _GAINS:
             raise ValueError("Invalid Gain Factor")
-            return
         self._gain = factor
-        if self._gain == 1:
-            self._c1_gains = Gain.GAIN_X1
-        elif self._gain == 2:
-            self._c1_gains = Gain.GAIN_X2
-        elif self._gain == 4:
-            self._c1_gains = Gain.GAIN_X4
-        elif self._gain == 8:
-            self._c1_gains = Gain.GAIN_X8
-        elif self._gain == 16:
-            self._c1_gains = Gain.GAIN_X16
-        elif self._gain == 32:
-            self._c1_gains = Gain.GAIN_X32
-        elif self._gain == 64:
-            self._c1_gains = Gain.GAIN_X64
-        elif self._gain == 128:
-            self._c1_gains = Gain.GAIN_X128
-        return
+        self._c1_gains = _GAINS[factor]
 
-    def enable(self, power=True):
+    def enable(self, power=True, timeout=1.0):
         """Enable(start) or disable(stop) the internal analog and digital
         systems power. Enable = True; Disable (low power) = False. Returns
         True when enabled; False when disabled."""
         self._enable = power
         if self._enable:
-            time.sleep(0.750)  # Wait 750ms; minimum 400ms
+            time.sleep(0.001)  # Simulated power-up ready polling
             return True
         time.sleep(0.010)  # Wait 10ms (200us minimum)
         return False
@@ -163,33 +296,480 @@ class FakeNAU7802:
         ADC data is unavailable."""
         return True
 
-    def read(self):
-        """Reads the 24-bit ADC data. Returns a signed integer value with
-        24-bit resolution. Assumes that the ADC data-ready bit was checked
-        to be True."""
-        self._adc_out = random.randrange(0, 16384)
+    @property
+    def strict(self):
+        """Stale sample handling mode. The fake never returns stale samples."""
+        return self._strict
+
+    @strict.setter
+    def strict(self, mode=None):
+        if mode not in (None, "SKIP", "RAISE"):
+            raise ValueError("Invalid Strict Mode")
+            return
+        self._strict = mode
+        return
+
+    @property
+    def fresh_samples(self):
+        """Number of samples read from new conversions."""
+        return self._fresh_samples
+
+    @property
+    def stale_samples(self):
+        """Number of samples read without a confirmed new conversion."""
+        return 0
+
+    @property
+    def missed_conversions(self):
+        """Number of conversions overwritten before they were read."""
+        return 0
+
+    def reset_sample_counts(self):
+        """Reset the fresh, stale, and missed sample counters."""
+        self._fresh_samples = 0
+        return
+
+    def _mux_residual(self, seconds, value):
+        """The previous channel's residual in a conversion at seconds."""
+        elapsed = seconds - self._switch_at
+        residual = (self._switch_from - value) * self._gain / 128
+        return residual * 2 ** (-24 * elapsed / self.settling_time)
+
+    def read(self, check_ready=False):
+        """Reads the 24-bit ADC data. Returns the raw value scaled by 2 as a
+        float, as NAU7802.read() does. The fake is always ready, so
+        check_ready is ignored."""
+        self._adc_out = self.read_raw() * 2.0
         return self._adc_out
 
-    def reset(self):
+    def read_raw(self, check_ready=False):
+        """Returns the next conversion of the selected channel's signal model
+        as a signed 24-bit integer. Conversions are timed by a simulated
+        sample clock advanced one conversion period per read, so results are
+        reproducible for seeded models. The fake is always ready, so
+        check_ready is ignored."""
+        seconds = self._sim_time
+        self._sim_time += 1 / self._conversion_rate
+        self._fresh_samples += 1
+        model = self.models[self._c2_chan_select]
+        value = model.sample(seconds, self._gain, self._conversion_rate)
+        if self._switch_at is not None:
+            if seconds - self._switch_at < self.settling_time:
+                value += self._mux_residual(seconds, model(seconds))
+                value = min(max(value, _FULL_SCALE[0]), _FULL_SCALE[1])
+            else:
+                self._switch_at = None
+        return int(value)
+
+    def generate(self, count):
+        """The next count conversions of the selected channel, generated in
+        one vectorized operation when NumPy is available. Returns an int32
+        NumPy array, or an array('i') without NumPy."""
+        if np is None:
+            return array("i", (self.read_raw() for _ in range(count)))
+        if self._switch_at is not None:
+            if self._sim_time - self._switch_at >= self.settling_time:
+                self._switch_at = None
+        if self._switch_at is not None:  # Mux settling artifacts
+            return np.fromiter((self.read_raw() for _ in range(count)), np.int32, count)
+        seconds = self._sim_time
+        self._sim_time += count / self._conversion_rate
+        self._fresh_samples += count
+        model = self.models[self._c2_chan_select]
+        values = model.generate(seconds, count, self._gain, self._conversion_rate)
+        return values.astype(np.int32)
+
+    def read_into(self, buf, count=None, channel=None, timeout=None):
+        """Fills a caller-supplied buffer with raw conversion values. Returns a
+        (collected, dropped) tuple. The fake never drops samples."""
+        if count is None:
+            count = len(buf)
+        if count > len(buf):
+            raise ValueError("Sample count exceeds buffer length")
+        if channel is not None:
+            self.channel = channel
+        if np is not None:
+            try:
+                target = np.asarray(memoryview(buf))
+            except TypeError:
+                target = None  # Not a buffer, such as a list
+            if target is not None:
+                target[:count] = self.generate(count)
+                return count, 0
+        for i in range(count):
+            buf[i] = self.read_raw()
+        return count, 0
+
+    def stream(self, channels=None, samples_per_switch=10):
+        """A generator that continuously yields (timestamp_ns, channel, raw)
+        tuples, cycling through the channels tuple. Samples are generated
+        without waiting; timestamp_ns is the simulated conversion time."""
+        if channels is None:
+            channels = (1, 2) if self._act_channels == 2 else (1,)
+        while True:
+            for chan in channels:
+                self._select_channel(chan)
+                for _ in range(self.settling_conversions):
+                    self.read_raw()  # Discard settling conversions
+                for _ in range(samples_per_switch):
+                    timestamp_ns = round(self._sim_time * 1_000_000_000)
+                    yield (timestamp_ns, chan, self.read_raw())
+
+    def reset(self, timeout=1.0):
         """Resets all device registers and enables digital system power.
         Returns the power ready status bit value: True when system is ready;
         False when system not ready for use."""
-        time.sleep(0.100)  # Wait 100ms; 10ms minimum
-        time.sleep(0.750)  # Wait 750ms; 400ms minimum
+        time.sleep(0.010)  # Wait 10ms minimum
+        time.sleep(0.001)  # Simulated power-up ready polling
         return True
 
-    def calibrate(self, mode="INTERNAL"):
+    def calibrate(self, mode="INTERNAL", timeout=1.0):
         """Perform the calibration procedure. Valid calibration modes
         are 'INTERNAL', 'OFFSET', and 'GAIN'. True if successful."""
-        if not (mode in dir(CalibrationMode)):
+        self.calibrate_start(mode, timeout)
+        time.sleep(0.010)  # 10ms
+        return self.calibrate_poll() == "DONE"
+
+    def calibrate_start(self, mode="INTERNAL", timeout=1.0):
+        """Start the calibration procedure without waiting for completion."""
+        if mode not in _CALIBRATION_MODES:
             raise ValueError("Invalid Calibration Mode")
-            return
         self._calib_mode = mode
-        if self._calib_mode == "INTERNAL":  # Internal PGA offset (zero setting)
-            self._c2_cal_mode = CalibrationMode.INTERNAL
-        elif self._calib_mode == "OFFSET":  # External PGA offset (zero setting)
-            self._c2_cal_mode = CalibrationMode.OFFSET
-        elif self._calib_mode == "GAIN":  # External PGA full-scale gain setting
-            self._c2_cal_mode = CalibrationMode.GAIN
-        time.sleep(0.010)  # 10ms
+        self._c2_cal_mode = _CALIBRATION_MODES[mode]
+        self._cal_started = time.monotonic()
+        return
+
+    def calibrate_poll(self):
+        """Check the progress of a calibration. The fake calibration is
+        always complete."""
+        self._cal_ended = time.monotonic()
+        return "DONE"
+
+    @property
+    def calibration_state(self):
+        """State of the most recent calibration."""
+        if self._cal_started is None:
+            return "IDLE"
+        return "DONE"
+
+    @property
+    def calibration_elapsed(self):
+        """Duration of the most recent calibration in seconds."""
+        if self._cal_started is None:
+            return None
+        return (self._cal_ended or time.monotonic()) - self._cal_started
+
+
+# Register-level simulation: a fake I2C bus and an emulated NAU7802 register
+#   map. The real cedargrove_nau7802.NAU7802 class runs unchanged against
+#   FakeI2C, e.g. NAU7802(FakeI2C(FakeNAU7802Device())), and the bus counts
+#   transactions and bytes so the per-sample bus cost can be measured.
+
+# Conversion periods (ns) and mux settling times (ns) indexed by _CTRL2[6:4]
+_SIM_PERIOD_NS = {0x0: 100_000_000, 0x1: 50_000_000, 0x2: 25_000_000}
+_SIM_PERIOD_NS.update({0x3: 12_500_000, 0x7: 3_125_000})
+_SIM_SETTLE_NS = {0x0: 400_000_000, 0x1: 200_000_000, 0x2: 100_000_000}
+_SIM_SETTLE_NS.update({0x3: 50_000_000, 0x7: 20_000_000})
+
+
+class FakeI2C:
+    """Simulated busio.I2C bus. Routes transactions to simulated devices by
+    address and counts transactions and bytes transferred."""
+
+    def __init__(self, device=None, address=0x2A):
+        self.devices = {}
+        if device is not None:
+            self.devices[address] = device
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Reset the transaction and byte counters."""
+        self.transactions = 0
+        self.writes = 0  # Write-only transactions
+        self.reads = 0  # Read and write-then-read transactions
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def _device(self, address):
+        if address in self.devices:
+            return self.devices[address]
+        found = []
+        for device in self.devices.values():
+            if isinstance(device, FakeTCA9548A):
+                found.extend(device.downstream(address))
+        if len(found) > 1:
+            raise OSError(5, "I2C address conflict: 0x%x" % address)
+        if not found:
+            raise OSError(19, "No I2C device at address: 0x%x" % address)
+        return found[0]
+
+    def try_lock(self):
         return True
+
+    def unlock(self):
+        return
+
+    def deinit(self):
+        return
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        self.transactions += 1
+        self.writes += 1
+        self.bytes_written += end - start
+        self._device(address).write(bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        self.transactions += 1
+        self.reads += 1
+        self.bytes_read += end - start
+        buffer[start:end] = self._device(address).read(end - start)
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+        self.transactions += 1
+        self.reads += 1
+        self.bytes_written += out_end - out_start
+        self.bytes_read += in_end - in_start
+        device = self._device(address)
+        device.write(bytes(out_buffer[out_start:out_end]))
+        in_buffer[in_start:in_end] = device.read(in_end - in_start)
+
+
+class FakeTCA9548A:
+    """Simulated TCA9548A-style I2C multiplexer for FakeI2C. Writing a byte
+    enables the downstream ports set in the bit mask. Devices on enabled ports
+    are reachable through the upstream FakeI2C bus."""
+
+    def __init__(self):
+        self.ports = [{} for _ in range(8)]  # Device by address for each port
+        self.selected = 0x00  # Bit mask of enabled ports
+        self.selects = 0  # Number of port selection writes
+
+    def add_device(self, port, device, address=0x2A):
+        """Connect a simulated device to a downstream port."""
+        self.ports[port][address] = device
+
+    def downstream(self, address):
+        """Devices at address on the enabled ports."""
+        return [
+            devices[address]
+            for port, devices in enumerate(self.ports)
+            if self.selected & (1 << port) and address in devices
+        ]
+
+    def write(self, data):
+        if data:
+            self.selected = data[-1]
+            self.selects += 1
+
+    def read(self, length):
+        return bytes((self.selected,)) * length
+
+
+class FakeNAU7802Device:
+    """Simulated NAU7802 register map for FakeI2C. Emulates the PU_CTRL power-up
+    and cycle ready bits, the CTRL1/CTRL2 fields, ADCO result bytes that update
+    at the configured conversion rate once the conversion cycle is started,
+    offset and gain calibration with a register set for each channel
+    (OCAL1/GCAL1 and OCAL2/GCAL2), and exponential analog multiplexer settling
+    after a channel change. Reading ADCO_B0 clears the cycle ready bit.
+
+    inputs holds the channel 1 and 2 input values in ADC counts at a PGA gain
+    of 128; each may be a number or a callable that receives the conversion
+    time in seconds. Inputs are scaled by the CTRL1 PGA gain setting. Gaussian
+    noise with a standard deviation of noise counts is added to each
+    conversion. The clock is a nanosecond time source."""
+
+    def __init__(self, inputs=(0, 0), noise=0, seed=None, clock=time.monotonic_ns):
+        self.inputs = list(inputs)
+        self.noise = noise
+        self.clock = clock
+        self._random = random.Random(seed)
+        self.power_up_ns = 200_000  # PUR delay after PUD is set
+        self.calibration_conversions = 4  # Calibration duration
+        self.conversions = 0  # Total conversions since instantiation
+        self._reset()
+
+    def _reset(self):
+        self.registers = bytearray(0x20)
+        self.registers[0x07] = 0x80  # GCAL1 = 0x00800000 (gain 1.0)
+        self.registers[0x0E] = 0x80  # GCAL2 = 0x00800000 (gain 1.0)
+        self.registers[0x1F] = 0x0F  # REV_ID
+        self.adc_register = 0x00  # Write side of 0x15
+        self._pointer = 0
+        self._power_up_at = None
+        self._cycle_start = None  # Time of the conversion cycle start
+        self._cycle_count = 0  # Conversions since the cycle start
+        self._calibration_end = None
+        self._switch_at = None  # Time of the last channel change
+        self._switch_from = 0  # Input value before the last channel change
+
+    def _input(self, chan, seconds):
+        source = self.inputs[chan]
+        if callable(source):
+            return source(seconds)
+        return source
+
+    def _update(self):
+        """Advance the power-up, conversion, and calibration state to now."""
+        now = self.clock()
+        regs = self.registers
+        if self._power_up_at is not None and now >= self._power_up_at:
+            regs[0x00] |= 0x08  # PUR
+            self._power_up_at = None
+        if self._cycle_start is None:
+            return
+        period = _SIM_PERIOD_NS.get((regs[0x02] >> 4) & 0x07, 100_000_000)
+        count = (now - self._cycle_start) // period
+        if count <= self._cycle_count:
+            return
+        self.conversions += count - self._cycle_count
+        self._cycle_count = count
+        conv_time = self._cycle_start + count * period
+        if self._calibration_end is not None and count >= self._calibration_end:
+            self._calibrate(conv_time)
+        value = self._convert(conv_time)
+        regs[0x12] = (value >> 16) & 0xFF
+        regs[0x13] = (value >> 8) & 0xFF
+        regs[0x14] = value & 0xFF
+        regs[0x00] |= 0x20  # CR
+
+    def _analog(self, conv_time):
+        """The settled or settling analog input value of the selected
+        channel after the PGA."""
+        chan = self.registers[0x02] >> 7
+        value = self._input(chan, conv_time / 1_000_000_000)
+        value = value * (1 << (self.registers[0x01] & 0x07)) / 128  # CTRL1 GAINS
+        if self._switch_at is not None:
+            settle = _SIM_SETTLE_NS.get((self.registers[0x02] >> 4) & 0x07)
+            elapsed = conv_time - self._switch_at
+            if elapsed >= settle:
+                self._switch_at = None
+            else:
+                # Residual decays to under one count at the settling time
+                value += (self._switch_from - value) * 2 ** (-24 * elapsed / settle)
+        return value
+
+    def _calibration_base(self):
+        """The OCALn_B2 register of the selected channel's calibration set."""
+        return 0x0A if self.registers[0x02] & 0x80 else 0x03
+
+    def _offset(self):
+        base = self._calibration_base()
+        ocal = int.from_bytes(self.registers[base : base + 3], "big")
+        return ocal - 0x1000000 if ocal & 0x800000 else ocal
+
+    def _gain(self):
+        base = self._calibration_base() + 3
+        return int.from_bytes(self.registers[base : base + 4], "big")
+
+    def _convert(self, conv_time):
+        value = self._analog(conv_time)
+        if self.noise:
+            value += self._random.gauss(0, self.noise)
+        value = int((value - self._offset()) * self._gain() / 0x800000)
+        return max(-0x800000, min(0x7FFFFF, value))
+
+    def _calibrate(self, conv_time):
+        """Complete the calibration selected by _CTRL2[1:0]."""
+        regs = self.registers
+        self._calibration_end = None
+        regs[0x02] &= ~0x0C  # Clear CALS and CAL_ERR
+        mode = regs[0x02] & 0x03
+        value = self._analog(conv_time)
+        base = self._calibration_base()
+        if mode == 0x2:  # System offset calibration
+            regs[base : base + 3] = (int(value) & 0xFFFFFF).to_bytes(3, "big")
+        elif mode == 0x3:  # System gain calibration
+            span = value - self._offset()
+            if span <= 0:
+                regs[0x02] |= 0x08  # CAL_ERR
+                return
+            gcal = min(0xFFFFFFFF, int(0x7FFFFF * 0x800000 / span))
+            regs[base + 3 : base + 7] = gcal.to_bytes(4, "big")
+
+    def _write_register(self, reg, value):
+        regs = self.registers
+        now = self.clock()
+        if reg == 0x00:
+            if value & 0x01:  # RR: reset all registers
+                self._reset()
+                self.registers[0x00] = 0x01
+                return
+            value = (value & ~0x28) | (regs[0x00] & 0x28)  # PUR and CR are R-
+            if value & 0x02 and not regs[0x00] & 0x02:
+                self._power_up_at = now + self.power_up_ns
+            if not value & 0x02:
+                value &= ~0x08
+                self._power_up_at = None
+            regs[0x00] = value
+            running = value & 0x16 == 0x16  # PUD, PUA, and CS
+            if running and self._cycle_start is None:
+                self._cycle_start = now
+                self._cycle_count = 0
+            elif not running:
+                self._cycle_start = None
+        elif reg == 0x02:
+            old = regs[0x02]
+            if (old ^ value) & 0x80:
+                self._switch_from = self._analog(now)
+                self._switch_at = now
+            if (old ^ value) & 0x70 and self._cycle_start is not None:
+                self._cycle_start = now  # A new rate restarts the cycle
+                self._cycle_count = 0
+            regs[0x02] = value
+            if value & 0x04 and not old & 0x04:  # CALS
+                self._calibration_end = self._cycle_count + self.calibration_conversions
+        elif reg == 0x15:
+            self.adc_register = value
+        elif reg in (0x12, 0x13, 0x14, 0x16, 0x1F):
+            return  # Read-only
+        else:
+            regs[reg] = value
+
+    def write(self, data):
+        """Receive an I2C write: a register address followed by data bytes
+        that are written to consecutive registers."""
+        self._update()
+        if not data:
+            return
+        self._pointer = data[0]
+        for value in data[1:]:
+            if self._pointer < len(self.registers):
+                self._write_register(self._pointer, value)
+            self._pointer += 1
+
+    def read(self, length):
+        """Return length bytes read from consecutive registers starting at the
+        register address pointer."""
+        self._update()
+        regs = self.registers
+        data = bytearray(length)
+        for i in range(length):
+            reg = self._pointer + i
+            if reg < len(regs):
+                data[i] = regs[reg]
+            if reg == 0x14:
+                regs[0x00] &= ~0x20  # Reading ADCO_B0 clears CR
+        self._pointer += length
+        return data
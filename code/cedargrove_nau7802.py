@@ -28,37 +28,75 @@ Implementation Notes
   https://circuitpython.org/downloads
 
 * Adafruit's Bus Device library: https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
-* Adafruit's Register library: https://github.com/adafruit/Adafruit_CircuitPython_Register
 """
 
+# pylint: disable=too-many-lines
+
 import time
-import struct
 
 from adafruit_bus_device.i2c_device import I2CDevice
-from adafruit_register.i2c_struct import ROUnaryStruct
 
-# from adafruit_register.i2c_struct   import UnaryStruct
-from adafruit_register.i2c_bits import RWBits
-from adafruit_register.i2c_bits import ROBits
-from adafruit_register.i2c_bit import RWBit
-from adafruit_register.i2c_bit import ROBit
+try:
+    from micropython import const
+except ImportError:
+
+    def const(value):
+        """Stand-in for micropython.const() on CPython."""
+        return value
+
 
 __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
 
 # DEVICE REGISTER MAP
-_PU_CTRL = 0x00  # Power-Up Control RW
-_CTRL1 = 0x01  # Control 1 RW
-_CTRL2 = 0x02  # Control 2 RW
-_ADCO_B2 = 0x12  # ADC_OUT[23:16] R-
-_ADCO_B1 = 0x13  # ADC_OUT[16: 8] R-
-_ADCO_B0 = 0x14  # ADC_OUT[ 7: 0] R-
-_OTP_B1 = 0x15  # OTP[15: 8] R-
-_ADC = 0x15  # ADC Control -W
-_OTP_B0 = 0x16  # OTP[ 7: 0] R-
-_PGA = 0x1B  # Programmable Gain Amplifier  RW
-_PWR_CTRL = 0x1C  # Power Control  RW
-_REV_ID = 0x1F  # Chip Revision ID  R-
+_PU_CTRL = const(0x00)  # Power-Up Control RW
+_CTRL1 = const(0x01)  # Control 1 RW
+_CTRL2 = const(0x02)  # Control 2 RW
+_OCAL1_B2 = const(0x03)  # Channel 1 offset calibration OCAL1[23:16] RW
+_OCAL1_B1 = const(0x04)  # Channel 1 offset calibration OCAL1[15: 8] RW
+_OCAL1_B0 = const(0x05)  # Channel 1 offset calibration OCAL1[ 7: 0] RW
+_GCAL1_B3 = const(0x06)  # Channel 1 gain calibration GCAL1[31:24] RW
+_GCAL1_B2 = const(0x07)  # Channel 1 gain calibration GCAL1[23:16] RW
+_GCAL1_B1 = const(0x08)  # Channel 1 gain calibration GCAL1[15: 8] RW
+_GCAL1_B0 = const(0x09)  # Channel 1 gain calibration GCAL1[ 7: 0] RW
+_OCAL2_B2 = const(0x0A)  # Channel 2 offset calibration OCAL2[23:16] RW
+_OCAL2_B1 = const(0x0B)  # Channel 2 offset calibration OCAL2[15: 8] RW
+_OCAL2_B0 = const(0x0C)  # Channel 2 offset calibration OCAL2[ 7: 0] RW
+_GCAL2_B3 = const(0x0D)  # Channel 2 gain calibration GCAL2[31:24] RW
+_GCAL2_B2 = const(0x0E)  # Channel 2 gain calibration GCAL2[23:16] RW
+_GCAL2_B1 = const(0x0F)  # Channel 2 gain calibration GCAL2[15: 8] RW
+_GCAL2_B0 = const(0x10)  # Channel 2 gain calibration GCAL2[ 7: 0] RW
+_ADCO_B2 = const(0x12)  # ADC_OUT[23:16] R-
+_ADCO_B1 = const(0x13)  # ADC_OUT[16: 8] R-
+_ADCO_B0 = const(0x14)  # ADC_OUT[ 7: 0] R-
+_OTP_B1 = const(0x15)  # OTP[15: 8] R-
+_ADC = const(0x15)  # ADC Control -W
+_OTP_B0 = const(0x16)  # OTP[ 7: 0] R-
+_PGA = const(0x1B)  # Programmable Gain Amplifier  RW
+_PWR_CTRL = const(0x1C)  # Power Control  RW
+_REV_ID = const(0x1F)  # Chip Revision ID  R-
+
+try:
+    from supervisor import ticks_ms as _ticks_ms  # Allocation-free ms ticks
+except ImportError:
+
+    def _ticks_ms():
+        """Millisecond ticks that wrap like supervisor.ticks_ms()."""
+        return (time.monotonic_ns() // 1_000_000) & _TICKS_MASK
+
+
+_TICKS_MASK = const(0x1FFFFFFF)  # supervisor.ticks_ms() wraps at 2**29
+
+# SHADOWED CONTROL REGISTERS
+_SHADOW_REGISTERS = (_PU_CTRL, _CTRL1, _CTRL2, _ADC, _PGA, _PWR_CTRL)
+_PU_CTRL_STATUS = const(0x29)  # PU_CTRL RR, PUR, and CR bits; not shadowed
+_CTRL2_STATUS = const(0x0C)  # CTRL2 CALS and CAL_ERR bits; not shadowed
+
+# BURST READ LENGTHS
+_ADCO_LEN = const(3)  # ADCO_B2 through ADCO_B0
+_CAL_LEN = const(7)  # OCALn_B2 through GCALn_B0 of one channel
+_STATUS_ADCO_LEN = const(21)  # PU_CTRL through ADCO_B0
+
 
 # pylint: disable=too-few-public-methods
 class LDOVoltage:
@@ -92,6 +130,18 @@ class ConversionRate:
     RATE_320SPS = 0x7  # 320 samples/sec; _CTRL2[6:4] = 7
 
 
+# ConversionRate setting and analog multiplexer settling time in seconds for
+# each conversion rate in samples per second; settling times were empirically
+# determined
+_CONV_RATES = {
+    10: (ConversionRate.RATE_10SPS, 0.400),
+    20: (ConversionRate.RATE_20SPS, 0.200),
+    40: (ConversionRate.RATE_40SPS, 0.100),
+    80: (ConversionRate.RATE_80SPS, 0.050),
+    320: (ConversionRate.RATE_320SPS, 0.020),
+}
+
+
 class CalibrationMode:
     """Calibration mode state settings."""
 
@@ -100,77 +150,399 @@ class CalibrationMode:
     GAIN = 0x3  # Gain   Calibration System;   _CTRL2[1:0] = 3
 
 
+# Register field settings for each LDO voltage, gain factor, and calibration
+# mode
+_LDO_VOLTAGES = {
+    "2V4": LDOVoltage.LDO_2V4,
+    "2V7": LDOVoltage.LDO_2V7,
+    "3V0": LDOVoltage.LDO_3V0,
+}
+_GAINS = {
+    1: Gain.GAIN_X1,
+    2: Gain.GAIN_X2,
+    4: Gain.GAIN_X4,
+    8: Gain.GAIN_X8,
+    16: Gain.GAIN_X16,
+    32: Gain.GAIN_X32,
+    64: Gain.GAIN_X64,
+    128: Gain.GAIN_X128,
+}
+_CALIBRATION_MODES = {
+    "INTERNAL": CalibrationMode.INTERNAL,  # Internal PGA offset (zero setting)
+    "OFFSET": CalibrationMode.OFFSET,  # External PGA offset (zero setting)
+    "GAIN": CalibrationMode.GAIN,  # External PGA full-scale gain setting
+}
+
+
+class _RegisterBits:
+    """A bit field of a control or status register that is read from and
+    written to the device on each access. Uses the NAU7802 transfer buffer
+    instead of a buffer per field. Single bit fields are booleans."""
+
+    __slots__ = ("bit_mask", "address", "lowest_bit", "read_only")
+
+    def __init__(self, num_bits, register_address, lowest_bit, read_only=False):
+        self.bit_mask = ((1 << num_bits) - 1) << lowest_bit
+        self.address = register_address
+        self.lowest_bit = lowest_bit
+        self.read_only = read_only
+
+    def __get__(self, obj, objtype=None):
+        buf = obj._buffer
+        buf[0] = self.address
+        with obj.i2c_device as i2c:
+            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1, in_end=2)
+        value = (buf[1] & self.bit_mask) >> self.lowest_bit
+        if self.bit_mask == 1 << self.lowest_bit:
+            return bool(value)
+        return value
+
+    def __set__(self, obj, value):
+        if self.read_only:
+            raise AttributeError("Read-only register field")
+        buf = obj._buffer
+        buf[0] = self.address
+        with obj.i2c_device as i2c:
+            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1, in_end=2)
+            reg = (buf[1] & ~self.bit_mask) | (
+                (value << self.lowest_bit) & self.bit_mask
+            )
+            buf[1] = reg
+            i2c.write(buf, end=2)
+
+
+class _ShadowBits:
+    """A bit field of a shadowed control register. Reads are served from the
+    register shadow without bus traffic. Writes update the shadow and are sent
+    to the device immediately, or once per register by NAU7802.apply() when
+    configuration changes are batched."""
+
+    __slots__ = ("bit_mask", "address", "lowest_bit")
+
+    def __init__(self, num_bits, register_address, lowest_bit):
+        self.bit_mask = ((1 << num_bits) - 1) << lowest_bit
+        self.address = register_address
+        self.lowest_bit = lowest_bit
+
+    def __get__(self, obj, objtype=None):
+        return (obj._shadow[self.address] & self.bit_mask) >> self.lowest_bit
+
+    def __set__(self, obj, value):
+        reg = obj._shadow[self.address]
+        new_reg = (reg & ~self.bit_mask) | ((value << self.lowest_bit) & self.bit_mask)
+        if new_reg == reg:
+            return
+        obj._shadow[self.address] = new_reg
+        obj._dirty |= 1 << self.address
+        if not obj._batch:
+            obj.apply()
+
+
+# Methods reported to the NAU7802Stats timing hook
+_TIMED_METHODS = (
+    "available",
+    "read_raw",
+    "read",
+    "read_into",
+    "reset",
+    "enable",
+    "calibrate",
+)
+
+
+# pylint: disable=too-many-instance-attributes
+class NAU7802Stats:
+    """Instrumentation counters of an NAU7802 instance; enabled with
+    NAU7802.stats_enabled. Counts I2C transactions and bytes, time spent in
+    time.sleep() by reset, enable, channel, and calibrate, time paused between
+    data-ready checks, and data-ready polls versus samples delivered. The optional hook is called as
+    hook(name, elapsed_ns) after each available, read_raw, read, read_into,
+    reset, enable, channel, and calibrate call."""
+
+    __slots__ = (
+        "_nau7802",
+        "hook",
+        "bus_reads",
+        "bus_writes",
+        "bytes_read",
+        "bytes_written",
+        "sleep_time",
+        "poll_wait_time",
+        "polls",
+    )
+
+    def __init__(self, nau7802):
+        self._nau7802 = nau7802
+        self.hook = None
+        self.reset()
+
+    def reset(self):
+        """Reset the counters, including the NAU7802 sample counters."""
+        self.bus_reads = 0  # Read and write-then-read transactions
+        self.bus_writes = 0  # Write-only transactions
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.sleep_time = 0.0  # Seconds
+        self.poll_wait_time = 0.0  # Seconds paused between data-ready checks
+        self.polls = 0  # Data-ready checks
+        self._nau7802.reset_sample_counts()
+
+    @property
+    def samples(self):
+        """Number of samples delivered."""
+        return self._nau7802.fresh_samples + self._nau7802.stale_samples
+
+    @property
+    def stale_samples(self):
+        """Number of samples delivered without a confirmed new conversion."""
+        return self._nau7802.stale_samples
+
+    @property
+    def missed_conversions(self):
+        """Number of conversions estimated to have been missed."""
+        return self._nau7802.missed_conversions
+
+    def sleep(self, seconds):
+        """time.sleep() replacement that accumulates the sleep time."""
+        start = time.monotonic_ns()
+        time.sleep(seconds)
+        self.sleep_time += (time.monotonic_ns() - start) / 1_000_000_000
+
+    def poll_wait(self, seconds):
+        """time.sleep() replacement that accumulates the pauses between
+        data-ready checks."""
+        start = time.monotonic_ns()
+        time.sleep(seconds)
+        self.poll_wait_time += (time.monotonic_ns() - start) / 1_000_000_000
+
+    def timed(self, name, method):
+        """Wrap method to report its elapsed time to the hook."""
+
+        def timed_method(*args, **kwargs):
+            hook = self.hook
+            if hook is None:
+                return method(*args, **kwargs)
+            start = time.monotonic_ns()
+            result = method(*args, **kwargs)
+            # pylint: disable-next=not-callable
+            hook(name, time.monotonic_ns() - start)
+            return result
+
+        return timed_method
+
+
+class _CountingI2CDevice:
+    """I2CDevice proxy that counts transactions and bytes in NAU7802Stats."""
+
+    __slots__ = ("_i2c_device", "_stats")
+
+    def __init__(self, i2c_device, stats):
+        self._i2c_device = i2c_device
+        self._stats = stats
+
+    def __enter__(self):
+        self._i2c_device.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._i2c_device.__exit__(exc_type, exc_value, traceback)
+
+    def readinto(self, buf, *, start=0, end=None):
+        """Read into buf and count one read transaction."""
+        if end is None:
+            end = len(buf)
+        self._i2c_device.readinto(buf, start=start, end=end)
+        self._stats.bus_reads += 1
+        self._stats.bytes_read += end - start
+
+    def write(self, buf, *, start=0, end=None):
+        """Write from buf and count one write transaction."""
+        if end is None:
+            end = len(buf)
+        self._i2c_device.write(buf, start=start, end=end)
+        self._stats.bus_writes += 1
+        self._stats.bytes_written += end - start
+
+    # pylint: disable=too-many-arguments
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        """Write then read with a repeated start and count one read
+        transaction."""
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+        self._i2c_device.write_then_readinto(
+            out_buffer,
+            in_buffer,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+        self._stats.bus_reads += 1
+        self._stats.bytes_written += out_end - out_start
+        self._stats.bytes_read += in_end - in_start
+
+
+# pylint: disable=too-many-public-methods
 class NAU7802:
     """The primary NAU7802 class."""
 
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, i2c_bus, address=0x2A, active_channels=1):
+    # pylint: disable=too-many-arguments
+    def __init__(self, i2c_bus, address=0x2A, active_channels=1, warm=False, drdy=None):
         """Instantiate NAU7802; LDO 3v0 volts, gain 128, 10 samples per second
         conversion rate, disabled ADC chopper clock, low ESR caps, and PGA output
-        stabilizer cap if in single channel mode. Returns True if successful."""
+        stabilizer cap if in single channel mode. Returns True if successful.
+        If warm is True and the device is already powered up, the register
+        reset is skipped and the LDO voltage, gain, and conversion rate are
+        read from the device instead of being set to the defaults.
+        The optional drdy object monitors the DRDY pin for data-ready
+        detection instead of I2C status polling. It can be a
+        ``digitalio.DigitalInOut``-style object with a ``value`` attribute or
+        a ``countio.Counter``-style object with a ``count`` attribute that
+        counts rising edges."""
         self.i2c_device = I2CDevice(i2c_bus, address)
-        if not self.reset():
-            raise RuntimeError("NAU7802 device could not be reset")
-        if not self.enable(True):
-            raise RuntimeError("NAU7802 device could not be enabled")
-        self.ldo_voltage = "3V0"  # 3.0-volt internal analog power (AVDD)
-        self._pu_ldo_source = True  # Internal analog power (AVDD)
-        self.gain = 128  # X128
-        self._c2_conv_rate = ConversionRate.RATE_10SPS  # 10 SPS; default
-        self._adc_chop_clock = 0x3  # 0x3 = Disable ADC chopper clock
-        self._pga_ldo_mode = 0x0  # 0x0 = Use low ESR capacitors
+        self._stats = None  # Instrumentation is disabled by default
+        self._sleep = time.sleep
+        # Register address byte followed by the burst read result bytes
+        self._buffer = bytearray(1 + _CAL_LEN)
+        # Control register shadow indexed by register address
+        self._shadow = bytearray(_PWR_CTRL + 1)
+        self._dirty = 0  # Bit mask of shadow registers awaiting apply()
+        self._batch = 0  # Nesting depth of batched configuration changes
+        if not (warm and self._attach()):
+            if not self.reset():
+                raise RuntimeError("NAU7802 device could not be reset")
+            if not self.enable(True):
+                raise RuntimeError("NAU7802 device could not be enabled")
+            with self:
+                self.ldo_voltage = "3V0"  # 3.0-volt internal analog power (AVDD)
+                self._pu_ldo_source = True  # Internal analog power (AVDD)
+                self.gain = 128  # X128
+                self.conversion_rate = 10  # 10 SPS; default
+                self._adc_chop_clock = 0x3  # 0x3 = Disable ADC chopper clock
+                self._pga_ldo_mode = 0x0  # 0x0 = Use low ESR capacitors
         self._act_channels = active_channels
         # 0x1 = Enable PGA out stabilizer cap for single channel use
         self._pc_cap_enable = 0x1
         if self._act_channels == 2:
             # 0x0 = Disable PGA out stabilizer cap for dual channel use
             self._pc_cap_enable = 0x0
+        self._drdy = drdy
+        self._drdy_counter = drdy is not None and hasattr(drdy, "count")
+        self._drdy_count = 0  # DRDY edge count at the last sample read
+        if drdy is not None:
+            with self:
+                self._c1_drdy_select = 0x0  # 0x0 = DRDY pin is conversion ready
+                self._c1_ready_polarity = 0x0  # 0x0 = DRDY pin is active high
+            if self._drdy_counter:
+                self._drdy_count = drdy.count
         self._calib_mode = None  # Initialize for later use
         self._adc_out = None  # Initialize for later use
+        self._ready = False  # Data-ready seen by available() since last read
+        self._profiles = {}  # Calibration register values for each channel
+        self._cal_state = "IDLE"
+        self._cal_timeout = None
+        self._cal_started = None
+        self._cal_ended = None
+        self._strict = None
+        self._status_burst = False
+        self.reset_sample_counts()
+
+    def __enter__(self):
+        """Batch configuration changes; each changed control register is
+        written once when the outermost context exits."""
+        self._batch += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch -= 1
+        if not self._batch:
+            self.apply()
 
     # DEFINE I2C DEVICE BITS, NYBBLES, BYTES, AND REGISTERS
     # Chip Revision  R-
-    _rev_id = ROBits(4, _REV_ID, 0, 1, False)
+    _rev_id = _RegisterBits(4, _REV_ID, 0, read_only=True)
     # Register Reset  (RR)  RW
-    _pu_reg_reset = RWBit(_PU_CTRL, 0, 1, False)
-    # Power-Up Digital Circuit  (PUD) RW
-    _pu_digital = RWBit(_PU_CTRL, 1, 1, False)
-    # Power-Up Analog Circuit  (PUA) RW
-    _pu_analog = RWBit(_PU_CTRL, 2, 1, False)
+    _pu_reg_reset = _RegisterBits(1, _PU_CTRL, 0)
+    # Power-Up Digital Circuit  (PUD) RW; shadowed
+    _pu_digital = _ShadowBits(1, _PU_CTRL, 1)
+    # Power-Up Analog Circuit  (PUA) RW; shadowed
+    _pu_analog = _ShadowBits(1, _PU_CTRL, 2)
     # Power-Up Ready Status  (PUR) R-
-    _pu_ready = ROBit(_PU_CTRL, 3, 1, False)
-    # Power-Up Conversion Cycle Start  (CS) RW
-    _pu_cycle_start = RWBit(_PU_CTRL, 4, 1, False)
+    _pu_ready = _RegisterBits(1, _PU_CTRL, 3, read_only=True)
+    # Power-Up Conversion Cycle Start  (CS) RW; shadowed
+    _pu_cycle_start = _ShadowBits(1, _PU_CTRL, 4)
     # Power-Up Cycle Ready  (CR) R-
-    _pu_cycle_ready = ROBit(_PU_CTRL, 5, 1, False)
-    # Power-Up AVDD Source  ADDS) RW
-    _pu_ldo_source = RWBit(_PU_CTRL, 7, 1, False)
-    # Control_1 Gain  (GAINS) RW
-    _c1_gains = RWBits(3, _CTRL1, 0, 1, False)
-    # Control_1 LDO Voltage  (VLDO) RW
-    _c1_vldo_volts = RWBits(3, _CTRL1, 3, 1, False)
-    # Control_2 Calibration Mode  (CALMOD) RW
-    _c2_cal_mode = RWBits(2, _CTRL2, 0, 1, False)
+    _pu_cycle_ready = _RegisterBits(1, _PU_CTRL, 5, read_only=True)
+    # Power-Up AVDD Source  ADDS) RW; shadowed
+    _pu_ldo_source = _ShadowBits(1, _PU_CTRL, 7)
+    # Control_1 Gain  (GAINS) RW; shadowed
+    _c1_gains = _ShadowBits(3, _CTRL1, 0)
+    # Control_1 LDO Voltage  (VLDO) RW; shadowed
+    _c1_vldo_volts = _ShadowBits(3, _CTRL1, 3)
+    # Control_1 DRDY Pin Function  (DRDY_SEL) RW; shadowed
+    _c1_drdy_select = _ShadowBits(1, _CTRL1, 6)
+    # Control_1 Conversion Ready Pin Polarity  (CRP) RW; shadowed
+    _c1_ready_polarity = _ShadowBits(1, _CTRL1, 7)
+    # Control_2 Calibration Mode  (CALMOD) RW; shadowed
+    _c2_cal_mode = _ShadowBits(2, _CTRL2, 0)
     # Control_2 Calibration Start  (CALS) RW
-    _c2_cal_start = RWBit(_CTRL2, 2, 1, False)
+    _c2_cal_start = _RegisterBits(1, _CTRL2, 2)
     # Control_2 Calibration Error (CAL_ERR) RW
-    _c2_cal_error = RWBit(_CTRL2, 3, 1, False)
-    # Control_2 Conversion Rate  (CRS) RW
-    _c2_conv_rate = RWBits(3, _CTRL2, 4, 1, False)
-    # Control_2 Channel Select  (CHS) RW
-    _c2_chan_select = RWBit(_CTRL2, 7, 1, False)
-    # ADC Result Output  MSByte R-
-    _adc_out_2 = ROUnaryStruct(_ADCO_B2, ">B")
-    # ADC Result Output  MidSByte R-
-    _adc_out_1 = ROUnaryStruct(_ADCO_B1, ">B")
-    # ADC Result Output  LSByte R-
-    _adc_out_0 = ROUnaryStruct(_ADCO_B0, ">B")
-    # ADC Chopper Clock Frequency Select  -W
-    _adc_chop_clock = RWBits(2, _ADC, 4, 1, False)
-    # PGA Stability/Accuracy Mode (LDOMODE) RW
-    _pga_ldo_mode = RWBit(_PGA, 6, 1, False)
-    # Power_Ctrl PGA Capacitor (PGA_CAP_EN) RW
-    _pc_cap_enable = RWBit(_PWR_CTRL, 7, 1, False)
+    _c2_cal_error = _RegisterBits(1, _CTRL2, 3)
+    # Control_2 Conversion Rate  (CRS) RW; shadowed
+    _c2_conv_rate = _ShadowBits(3, _CTRL2, 4)
+    # Control_2 Channel Select  (CHS) RW; shadowed
+    _c2_chan_select = _ShadowBits(1, _CTRL2, 7)
+    # ADC Chopper Clock Frequency Select  -W; shadowed
+    _adc_chop_clock = _ShadowBits(2, _ADC, 4)
+    # PGA Stability/Accuracy Mode (LDOMODE) RW; shadowed
+    _pga_ldo_mode = _ShadowBits(1, _PGA, 6)
+    # Power_Ctrl PGA Capacitor (PGA_CAP_EN) RW; shadowed
+    _pc_cap_enable = _ShadowBits(1, _PWR_CTRL, 7)
+
+    def apply(self):
+        """Write each shadowed control register changed since the last apply
+        to the device once. Called automatically unless configuration changes
+        are batched with a context manager, e.g. ``with nau7802:``."""
+        if not self._dirty:
+            return
+        buf = self._buffer
+        with self.i2c_device as i2c:
+            for reg in _SHADOW_REGISTERS:
+                if self._dirty & (1 << reg):
+                    buf[0] = reg
+                    buf[1] = self._shadow[reg]
+                    i2c.write(buf, end=2)
+        self._dirty = 0
+
+    def _load_shadow(self):
+        """Read the device control registers into the register shadow. The
+        write-only ADC register assumes its reset value."""
+        buf = self._buffer
+        with self.i2c_device as i2c:
+            buf[0] = _PU_CTRL
+            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1, in_end=4)
+            self._shadow[_PU_CTRL] = buf[1] & ~_PU_CTRL_STATUS
+            self._shadow[_CTRL1] = buf[2]
+            self._shadow[_CTRL2] = buf[3] & ~_CTRL2_STATUS
+            buf[0] = _PGA
+            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1, in_end=3)
+            self._shadow[_PGA] = buf[1]
+            self._shadow[_PWR_CTRL] = buf[2]
+        self._shadow[_ADC] = 0x00
+        self._dirty = 0
 
     @property
     def chip_revision(self):
@@ -185,17 +557,58 @@ class NAU7802:
     @channel.setter
     def channel(self, chan=1):
         """Select the active channel. Valid channel numbers are 1 and 2.
-        Analog multiplexer settling time was emperically determined to be
-        approximately 400ms at 10SPS, 200ms at 20SPS, 100ms at 40SPS,
-        50ms at 80SPS, and 20ms at 320SPS."""
+        Waits for the analog multiplexer settling time of the current
+        conversion rate; emperically determined to be approximately 400ms at
+        10SPS, 200ms at 20SPS, 100ms at 40SPS, 50ms at 80SPS, and 20ms at
+        320SPS."""
+        change = self._change_channel
+        if self._stats is not None:
+            change = self._stats.timed("channel", change)
+        change(chan)
+
+    def _change_channel(self, chan):
+        """Select the active channel and wait for the settling time."""
+        self._select_channel(chan)
+        self._sleep(self.settling_time)
+
+    def _select_channel(self, chan):
+        """Select the active channel without waiting for settling."""
         if chan == 1:
             self._c2_chan_select = 0x0
-            time.sleep(0.400)  # 400ms settling time for 10SPS
         elif chan == 2 and self._act_channels == 2:
             self._c2_chan_select = 0x1
-            time.sleep(0.400)  # 400ms settling time for 10SPS
         else:
             raise ValueError("Invalid Channel Number")
+        self.apply()  # Settle after the channel change reaches the device
+        self._ready = False
+        self._last_fresh = None  # Settling conversions are not missed
+
+    @property
+    def conversion_rate(self):
+        """The ADC conversion rate in samples per second."""
+        return self._conversion_rate
+
+    @conversion_rate.setter
+    def conversion_rate(self, rate=10):
+        """Select the ADC conversion rate. Valid rates are 10, 20, 40, 80, and
+        320 samples per second."""
+        if rate not in _CONV_RATES:
+            raise ValueError("Invalid Conversion Rate")
+        self._conversion_rate = rate
+        self._c2_conv_rate = _CONV_RATES[rate][0]
+        self._last_fresh = None
+
+    @property
+    def settling_time(self):
+        """The analog multiplexer settling time in seconds for the current
+        conversion rate."""
+        return _CONV_RATES[self._conversion_rate][1]
+
+    @property
+    def settling_conversions(self):
+        """The number of conversions to discard after a channel change instead
+        of waiting for the settling time at the current conversion rate."""
+        return -(-int(self.settling_time * 1000) * self._conversion_rate // 1000)
 
     @property
     def ldo_voltage(self):
@@ -205,15 +618,11 @@ class NAU7802:
     @ldo_voltage.setter
     def ldo_voltage(self, voltage="EXTERNAL"):
         """Select the LDO Voltage. Valid voltages are '2V4', '2V7', '3V0'."""
-        if not "LDO_" + voltage in dir(LDOVoltage):
+        setting = _LDO_VOLTAGES.get(voltage)
+        if setting is None:
             raise ValueError("Invalid LDO Voltage")
         self._ldo_voltage = voltage
-        if self._ldo_voltage == "2V4":
-            self._c1_vldo_volts = LDOVoltage.LDO_2V4
-        elif self._ldo_voltage == "2V7":
-            self._c1_vldo_volts = LDOVoltage.LDO_2V7
-        elif self._ldo_voltage == "3V0":
-            self._c1_vldo_volts = LDOVoltage.LDO_3V0
+        self._c1_vldo_volts = setting
 
     @property
     def gain(self):
@@ -224,83 +633,547 @@ class NAU7802:
     def gain(self, factor=1):
         """Select PGA gain factor. Valid values are '1, 2, 4, 8, 16, 32, 64,
         and 128."""
-        if not "GAIN_X" + str(factor) in dir(Gain):
+        setting = _GAINS.get(factor)
+        if setting is None:
             raise ValueError("Invalid Gain Factor")
         self._gain = factor
-        if self._gain == 1:
-            self._c1_gains = Gain.GAIN_X1
-        elif self._gain == 2:
-            self._c1_gains = Gain.GAIN_X2
-        elif self._gain == 4:
-            self._c1_gains = Gain.GAIN_X4
-        elif self._gain == 8:
-            self._c1_gains = Gain.GAIN_X8
-        elif self._gain == 16:
-            self._c1_gains = Gain.GAIN_X16
-        elif self._gain == 32:
-            self._c1_gains = Gain.GAIN_X32
-        elif self._gain == 64:
-            self._c1_gains = Gain.GAIN_X64
-        elif self._gain == 128:
-            self._c1_gains = Gain.GAIN_X128
-
-    def enable(self, power=True):
+        self._c1_gains = setting
+
+    def enable(self, power=True, timeout=1.0):
         """Enable(start) or disable(stop) the internal analog and digital
-        systems power. Enable = True; Disable (low power) = False. Returns
-        True when enabled; False when disabled."""
+        systems power. Enable = True; Disable (low power) = False. When
+        enabling, polls the power-up ready bit for up to timeout seconds.
+        Returns True when enabled; False when disabled or not ready."""
         self._enable = power
         if self._enable:
             self._pu_analog = True
             self._pu_digital = True
-            time.sleep(0.750)  # Wait 750ms; minimum 400ms
-            self._pu_start = True  # Start acquisition system cycling
-            return self._pu_ready
+            if not self._wait_ready(timeout):
+                return False
+            self._pu_cycle_start = True  # Start acquisition system cycling
+            return True
         self._pu_analog = False
         self._pu_digital = False
-        time.sleep(0.010)  # Wait 10ms (200us minimum)
+        self._sleep(0.010)  # Wait 10ms (200us minimum)
         return False
 
     def available(self):
         """Read the ADC data-ready status. True when data is available; False when
-        ADC data is unavailable."""
-        return self._pu_cycle_ready
-
-    def read(self):
-        """Reads the 24-bit ADC data. Returns a signed integer value with
-        24-bit resolution. Assumes that the ADC data-ready bit was checked
-        to be True."""
-        adc = self._adc_out_2 << 24  # [31:24] << MSByte
-        adc = adc | (self._adc_out_1 << 16)  # [23:16] << MidSByte
-        adc = adc | (self._adc_out_0 << 8)  # [15: 8] << LSByte
-        adc = adc.to_bytes(4, "big")  # Pack to 4-byte (32-bit) structure
-        value = struct.unpack(">i", adc)[0]  # Unpack as 4-byte signed integer
-        self._adc_out = value / 128  # Restore to 24-bit signed integer value
+        ADC data is unavailable. Uses the DRDY pin without bus traffic if a
+        drdy object was specified. A following read is counted as fresh."""
+        if self._stats is not None:
+            self._stats.polls += 1
+        if self._drdy is None:
+            ready = self._pu_cycle_ready
+        elif self._drdy_counter:
+            ready = self._drdy.count != self._drdy_count
+        else:
+            ready = self._drdy.value
+        if ready:
+            self._ready = True
+        return ready
+
+    @property
+    def strict(self):
+        """Stale sample handling mode of read() and read_raw(). None (default)
+        returns stale samples and counts them; 'SKIP' waits for the next fresh
+        conversion; 'RAISE' raises RuntimeError."""
+        return self._strict
+
+    @strict.setter
+    def strict(self, mode=None):
+        if mode not in (None, "SKIP", "RAISE"):
+            raise ValueError("Invalid Strict Mode")
+        self._strict = mode
+
+    @property
+    def fresh_samples(self):
+        """Number of samples read from new conversions."""
+        return self._fresh_samples
+
+    @property
+    def stale_samples(self):
+        """Number of samples read without a confirmed new conversion, i.e. a
+        repeat of a previously read conversion or an unchecked read."""
+        return self._stale_samples
+
+    @property
+    def missed_conversions(self):
+        """Number of conversions estimated to have been overwritten before they
+        were read, based on the time between fresh samples. Conversions
+        discarded while settling after a channel change are not counted."""
+        return self._missed_conversions
+
+    def reset_sample_counts(self):
+        """Reset the fresh, stale, and missed sample counters."""
+        self._fresh_samples = 0
+        self._stale_samples = 0
+        self._missed_conversions = 0
+        self._last_fresh = None
+
+    @property
+    def stats_enabled(self):
+        """True when bus, sleep, and polling instrumentation is collected."""
+        return self._stats is not None
+
+    @stats_enabled.setter
+    def stats_enabled(self, enable=False):
+        """Enable or disable instrumentation. When disabled (the default), the
+        driver runs without counting or timing overhead."""
+        if enable and self._stats is None:
+            self._stats = NAU7802Stats(self)
+            self._device = self.i2c_device
+            self.i2c_device = _CountingI2CDevice(self._device, self._stats)
+            self._sleep = self._stats.sleep
+            for name in _TIMED_METHODS:
+                setattr(self, name, self._stats.timed(name, getattr(self, name)))
+        elif not enable and self._stats is not None:
+            self._stats = None
+            self.i2c_device = self._device
+            self._sleep = time.sleep
+            for name in _TIMED_METHODS:
+                delattr(self, name)
+
+    @property
+    def stats(self):
+        """The NAU7802Stats instrumentation counters; None when disabled."""
+        return self._stats
+
+    def _drdy_ready(self):
+        """Check the DRDY pin for a new conversion without bus traffic. Edges
+        counted before the check are consumed by the read that follows.
+        Always False without a DRDY pin."""
+        if self._drdy is None:
+            return False
+        if self._stats is not None:
+            self._stats.polls += 1
+        if self._drdy_counter:
+            count = self._drdy.count
+            if count == self._drdy_count:
+                return False
+            self._drdy_count = count
+            return True
+        return self._drdy.value
+
+    @property
+    def status_burst(self):
+        """True when data-ready checks read PU_CTRL through ADCO_B0 in a single
+        21-byte transaction instead of a 1-byte status read followed by a
+        3-byte result read. See the status_burst setter."""
+        return self._status_burst
+
+    @status_burst.setter
+    def status_burst(self, enable=False):
+        """Enable or disable the combined status and result burst read. The
+        combined read returns a ready conversion in one transaction, which
+        suits buses with a high per-transaction cost, but moves 21 bytes per
+        check; the default 1-byte status read is cheaper while polling for a
+        conversion that is not ready yet. Enabling it enlarges the transfer
+        buffer to 22 bytes."""
+        self._status_burst = bool(enable)
+        size = 1 + (_STATUS_ADCO_LEN if enable else _CAL_LEN)
+        if len(self._buffer) != size:
+            self._buffer = bytearray(size)
+
+    def _burst_read(self, status):
+        """Read the ADC result registers into the buffer in one transaction.
+        If status is True, the PU_CTRL cycle ready bit is first checked with a
+        1-byte read and the result registers are only read once a new
+        conversion is ready; with status_burst enabled, PU_CTRL through
+        ADCO_B0 are read in a single transaction instead. Returns the buffer
+        index of the result MSByte, or None if status is True and a new
+        conversion is not ready."""
+        buf = self._buffer
+        if status and self._status_burst:
+            if self._stats is not None:
+                self._stats.polls += 1
+            buf[0] = _PU_CTRL
+            with self.i2c_device as i2c:
+                i2c.write_then_readinto(
+                    buf, buf, out_end=1, in_start=1, in_end=1 + _STATUS_ADCO_LEN
+                )
+            if not buf[1] & 0x20:  # PU_CTRL[5] cycle ready (CR)
+                return None
+            return 1 + _ADCO_B2 - _PU_CTRL
+        with self.i2c_device as i2c:
+            if status:
+                if self._stats is not None:
+                    self._stats.polls += 1
+                buf[0] = _PU_CTRL
+                i2c.write_then_readinto(buf, buf, out_end=1, in_start=1, in_end=2)
+                if not buf[1] & 0x20:  # PU_CTRL[5] cycle ready (CR)
+                    return None
+            buf[0] = _ADCO_B2
+            i2c.write_then_readinto(
+                buf, buf, out_end=1, in_start=1, in_end=1 + _ADCO_LEN
+            )
+        return 1
+
+    def _pause(self):
+        """Wait between data-ready checks: until shortly before the next
+        conversion is expected after a fresh sample, otherwise for a sixteenth
+        of a conversion period. Counted in stats.poll_wait_time, not
+        stats.sleep_time."""
+        wait = 1 / (16 * self._conversion_rate)
+        if self._last_fresh is not None:
+            elapsed = (_ticks_ms() - self._last_fresh) & _TICKS_MASK
+            remaining = 875 // self._conversion_rate - elapsed  # 7/8 period (ms)
+            if remaining > 0:
+                wait = remaining / 1000
+        if self._stats is None:
+            time.sleep(wait)
+        else:
+            self._stats.poll_wait(wait)
+
+    def _wait_fresh(self):
+        """Wait up to ten conversion periods for a new conversion and read it.
+        Returns the buffer index of the result MSByte."""
+        start = _ticks_ms()
+        while True:
+            if self._drdy is None:
+                msb = self._burst_read(True)
+                if msb is not None:
+                    return msb
+            elif self._drdy_ready():
+                return self._burst_read(False)
+            if ((_ticks_ms() - start) & _TICKS_MASK) * self._conversion_rate > 10_000:
+                raise RuntimeError("NAU7802 conversion timed out")
+            self._pause()
+
+    def read_raw(self, check_ready=False):
+        """Reads the 24-bit ADC data with a single burst transaction of the
+        ADCO_B2, ADCO_B1, and ADCO_B0 registers. Returns the signed 24-bit
+        conversion value as an integer without allocating heap memory. Assumes
+        that the ADC data-ready bit was checked to be True. If check_ready is
+        True, the PU_CTRL cycle-ready bit is checked first with a 1-byte read
+        (or in the same transaction if status_burst is enabled) and None is
+        returned when a new conversion is not available. With a DRDY
+        pin, only the ADC result registers are read. Samples are counted as
+        fresh or stale and handled according to the strict mode."""
+        ready = self._drdy_ready() or self._ready
+        self._ready = False
+        if ready:
+            msb = self._burst_read(False)
+        elif self._drdy is None and (check_ready or self._strict):
+            msb = self._burst_read(True)
+            ready = msb is not None
+        if not ready:
+            if check_ready:
+                return None
+            if self._strict == "RAISE":
+                raise RuntimeError("NAU7802 conversion is stale")
+            if self._strict == "SKIP":
+                msb = self._wait_fresh()
+                ready = True
+            else:
+                msb = self._burst_read(False)
+        buf = self._buffer
+        value = (buf[msb] << 16) | (buf[msb + 1] << 8) | buf[msb + 2]
+        if value & 0x800000:  # Sign-extend the 24-bit two's complement value
+            value -= 0x1000000
+        if ready:
+            self._fresh_samples += 1
+            now = _ticks_ms()
+            if self._last_fresh is not None:
+                # Round elapsed time to whole conversion periods
+                elapsed = (now - self._last_fresh) & _TICKS_MASK
+                elapsed = (elapsed * self._conversion_rate + 500) // 1000
+                if elapsed > 1:
+                    self._missed_conversions += elapsed - 1
+            self._last_fresh = now
+        else:
+            self._stale_samples += 1
+        return value
+
+    def read(self, check_ready=False):
+        """Reads the 24-bit ADC data. Returns a signed value with 24-bit
+        resolution as a float (the raw value scaled by 2, as in previous
+        versions of the driver). Assumes that the ADC data-ready bit was
+        checked to be True. If check_ready is True, returns None when a new
+        conversion is not available. See read_raw()."""
+        value = self.read_raw(check_ready)
+        if value is None:
+            return None
+        self._adc_out = value * 2.0  # Compatible with the former value / 128
         return self._adc_out
 
-    def reset(self):
-        """Resets all device registers and enables digital system power.
-        Returns the power ready status bit value: True when system is ready;
-        False when system not ready for use."""
+    def read_into(self, buf, count=None, channel=None, timeout=None):
+        """Fills a caller-supplied buffer, such as an array('i') or a writable
+        memoryview, with consecutive raw 24-bit conversion values. Data-ready
+        is polled internally, pausing until shortly before each conversion is
+        expected. Reads len(buf) samples if count is not specified. Selects the channel
+        first if specified. Stops early if no new conversion arrives within
+        timeout seconds of the previous one; defaults to ten conversion
+        periods. Returns a (collected, dropped) tuple where dropped is the number
+        of conversions estimated to have been missed between samples."""
+        if count is None:
+            count = len(buf)
+        if count > len(buf):
+            raise ValueError("Sample count exceeds buffer length")
+        if channel is not None:
+            self.channel = channel
+        if timeout is None:
+            timeout_ms = 10_000 // self._conversion_rate
+        else:
+            timeout_ms = int(timeout * 1000)
+        read_raw = self.read_raw
+        missed = self._missed_conversions
+        self._last_fresh = None  # Do not count conversions before the call
+        collected = 0
+        last = _ticks_ms()
+        while collected < count:
+            value = read_raw(True)
+            if value is None:
+                if (_ticks_ms() - last) & _TICKS_MASK > timeout_ms:
+                    break
+                self._pause()
+                continue
+            last = self._last_fresh
+            buf[collected] = value
+            collected += 1
+        return collected, self._missed_conversions - missed
+
+    def stream(self, channels=None, samples_per_switch=10):
+        """A generator that continuously yields (timestamp_ns, channel, raw)
+        tuples where timestamp_ns is the time.monotonic_ns() value when the
+        conversion was detected and raw is the signed 24-bit value. Cycles
+        through the channels tuple, defaulting to all active channels, and
+        yields samples_per_switch conversions from each. After each channel
+        change, settling_conversions conversions are discarded instead of
+        sleeping for the settling time. Selects a single channel only once.
+        Data-ready is polled as in read_into()."""
+        if channels is None:
+            channels = (1, 2) if self._act_channels == 2 else (1,)
+        read_raw = self.read_raw
+        monotonic_ns = time.monotonic_ns
+        switching = len(channels) > 1
+        discard = 0
+        if not switching and self.channel != channels[0]:
+            self._select_channel(channels[0])
+            discard = self.settling_conversions
+        while True:
+            for chan in channels:
+                if switching:
+                    self._select_channel(chan)
+                    discard = self.settling_conversions
+                count = 0
+                while count < samples_per_switch:
+                    value = read_raw(True)
+                    if value is None:
+                        self._pause()
+                        continue
+                    if discard:
+                        discard -= 1
+                        continue
+                    yield (monotonic_ns(), chan, value)
+                    count += 1
+
+    def reset(self, timeout=1.0):
+        """Resets all device registers and enables digital system power. Polls
+        the power-up ready bit for up to timeout seconds. Returns the power
+        ready status bit value: True when system is ready; False when system
+        not ready for use."""
         self._pu_reg_reset = True  # Reset all registers)
-        time.sleep(0.100)  # Wait 100ms; 10ms minimum
+        self._sleep(0.010)  # Wait 10ms minimum
         self._pu_reg_reset = False
+        self._load_shadow()
         self._pu_digital = True
-        time.sleep(0.750)  # Wait 750ms; 400ms minimum
-        return self._pu_ready
+        return self._wait_ready(timeout)
+
+    def _wait_ready(self, timeout):
+        """Poll the power-up ready bit until set or until timeout seconds have
+        elapsed. Returns the power-up ready bit value."""
+        start = _ticks_ms()
+        timeout_ms = int(timeout * 1000)
+        while not self._pu_ready:
+            if (_ticks_ms() - start) & _TICKS_MASK > timeout_ms:
+                return False
+            self._sleep(0.001)  # 1ms
+        return True
+
+    def _attach(self):
+        """Adopt the configuration of an already powered-up device. Returns
+        False if the device is not powered up or not configured by this
+        driver. Starts conversions if the cycle start bit is clear."""
+        self._load_shadow()
+        if not (self._pu_ready and self._pu_analog and self._pu_digital):
+            return False
+        ldo = self._c1_vldo_volts
+        rate = self._c2_conv_rate
+        for voltage, setting in _LDO_VOLTAGES.items():
+            if setting == ldo:
+                break
+        else:
+            return False
+        for sps, setting in _CONV_RATES.items():
+            if setting[0] == rate:
+                break
+        else:
+            return False
+        if not self._pu_cycle_start:
+            self._pu_cycle_start = True  # Start acquisition system cycling
+        self._enable = True
+        self._ldo_voltage = voltage
+        self._gain = 1 << self._c1_gains
+        self._conversion_rate = sps
+        return True
+
+    @property
+    def calibration_registers(self):
+        """The (offset, gain) values of the current channel's offset and gain
+        calibration registers (OCAL1/GCAL1 or OCAL2/GCAL2), read in one
+        transaction. The offset is a signed 24-bit value and the gain an
+        unsigned 32-bit value where 0x00800000 is unity."""
+        self._read_calibration(self.channel)
+        return self._decode_calibration(self._buffer, 1)
 
-    def calibrate(self, mode="INTERNAL"):
+    @calibration_registers.setter
+    def calibration_registers(self, values):
+        """Write the current channel's (offset, gain) calibration register
+        values in one transaction. The written values are not stored as the
+        calibration profile of the channel."""
+        self._write_calibration(self._encode_calibration(*values), self.channel)
+
+    @staticmethod
+    def _encode_calibration(offset, gain):
+        """Pack (offset, gain) values into the 7 calibration register bytes."""
+        offset = (offset & 0xFFFFFF).to_bytes(3, "big")
+        return offset + (gain & 0xFFFFFFFF).to_bytes(4, "big")
+
+    @staticmethod
+    def _decode_calibration(buf, start):
+        """Unpack (offset, gain) values from 7 calibration register bytes."""
+        offset = (buf[start] << 16) | (buf[start + 1] << 8) | buf[start + 2]
+        if offset & 0x800000:
+            offset -= 0x1000000
+        gain = int.from_bytes(buf[start + 3 : start + 7], "big")
+        return (offset, gain)
+
+    @staticmethod
+    def _calibration_address(chan):
+        """The first calibration register of a channel's set."""
+        if chan == 1:
+            return _OCAL1_B2
+        if chan == 2:
+            return _OCAL2_B2
+        raise ValueError("Invalid Channel Number")
+
+    def _read_calibration(self, chan):
+        """Read a channel's 7 calibration register bytes into the buffer,
+        starting at index 1, in one burst transaction."""
+        buf = self._buffer
+        buf[0] = self._calibration_address(chan)
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(
+                buf, buf, out_end=1, in_start=1, in_end=1 + _CAL_LEN
+            )
+
+    def _write_calibration(self, values, chan):
+        """Write a channel's 7 calibration register bytes in one burst
+        transaction."""
+        buf = self._buffer
+        buf[0] = self._calibration_address(chan)
+        buf[1 : 1 + _CAL_LEN] = values
+        with self.i2c_device as i2c:
+            i2c.write(buf, end=1 + _CAL_LEN)
+
+    def _store_profile(self):
+        """Save the current channel's calibration registers as its
+        profile."""
+        chan = self.channel
+        self._read_calibration(chan)
+        self._profiles[chan] = bytes(self._buffer[1 : 1 + _CAL_LEN])
+
+    @property
+    def calibration_profiles(self):
+        """The stored calibration profile of each channel as a dictionary of
+        channel: (offset, gain) items. The device keeps a separate calibration
+        register set for each channel, so profiles are only needed to persist
+        calibrations: they are stored after each successful calibration. Assign
+        a previously saved dictionary (e.g. loaded from JSON) to skip
+        calibration after a restart; each profile is written to its channel's
+        registers immediately."""
+        return {
+            chan: self._decode_calibration(values, 0)
+            for chan, values in self._profiles.items()
+        }
+
+    @calibration_profiles.setter
+    def calibration_profiles(self, profiles):
+        self._profiles = {}
+        for chan, (offset, gain) in profiles.items():
+            chan = int(chan)
+            values = self._encode_calibration(offset, gain)
+            self._write_calibration(values, chan)
+            self._profiles[chan] = values
+
+    def calibrate(self, mode="INTERNAL", timeout=1.0):
         """Perform the calibration procedure. Valid calibration modes
-        are 'INTERNAL', 'OFFSET', and 'GAIN'. True if successful."""
-        if not mode in dir(CalibrationMode):
+        are 'INTERNAL', 'OFFSET', and 'GAIN'. True if successful; False if the
+        calibration error bit is set. Raises RuntimeError if the calibration
+        does not complete within timeout seconds."""
+        self.calibrate_start(mode, timeout)
+        while self.calibrate_poll() == "RUNNING":
+            self._sleep(0.010)  # 10ms
+        if self._cal_state == "TIMEOUT":
+            raise RuntimeError("NAU7802 calibration timed out")
+        return self._cal_state == "DONE"
+
+    def calibrate_start(self, mode="INTERNAL", timeout=1.0):
+        """Start the calibration procedure without waiting for completion.
+        Valid calibration modes are 'INTERNAL', 'OFFSET', and 'GAIN'. Call
+        calibrate_poll() until the calibration is no longer 'RUNNING'."""
+        self._start_calibration(mode)
+        self._cal_state = "RUNNING"
+        self._cal_timeout = int(timeout * 1000)  # ms
+        self._cal_started = _ticks_ms()
+        self._cal_ended = None
+
+    def calibrate_poll(self):
+        """Check the progress of a calibration started with calibrate_start().
+        Returns the calibration_state."""
+        if self._cal_state == "RUNNING":
+            if not self._c2_cal_start:
+                self._cal_ended = _ticks_ms()
+                self._cal_state = "DONE" if self._finish_calibration() else "ERROR"
+            else:
+                now = _ticks_ms()
+                if (now - self._cal_started) & _TICKS_MASK > self._cal_timeout:
+                    self._cal_ended = now
+                    self._cal_state = "TIMEOUT"
+        return self._cal_state
+
+    @property
+    def calibration_state(self):
+        """State of the most recent calibration: 'IDLE' if none was started,
+        'RUNNING', 'DONE', 'ERROR' if the device set the calibration error
+        bit, or 'TIMEOUT'. Updated by calibrate_poll()."""
+        return self._cal_state
+
+    @property
+    def calibration_elapsed(self):
+        """Seconds elapsed since the most recent calibration was started, or its
+        duration once completed. None if no calibration was started."""
+        if self._cal_started is None:
+            return None
+        end = _ticks_ms() if self._cal_ended is None else self._cal_ended
+        return ((end - self._cal_started) & _TICKS_MASK) / 1000
+
+    def _finish_calibration(self):
+        """Check the calibration error bit of a completed calibration and store
+        the calibration profile of the current channel. True if successful."""
+        if self._c2_cal_error:
+            return False
+        self._store_profile()
+        return True
+
+    def _start_calibration(self, mode):
+        """Select the calibration mode and start the calibration procedure
+        without waiting for completion."""
+        setting = _CALIBRATION_MODES.get(mode)
+        if setting is None:
             raise ValueError("Invalid Calibration Mode")
         self._calib_mode = mode
-        if self._calib_mode == "INTERNAL":  # Internal PGA offset (zero setting)
-            self._c2_cal_mode = CalibrationMode.INTERNAL
-        elif self._calib_mode == "OFFSET":  # External PGA offset (zero setting)
-            self._c2_cal_mode = CalibrationMode.OFFSET
-        elif self._calib_mode == "GAIN":  # External PGA full-scale gain setting
-            self._c2_cal_mode = CalibrationMode.GAIN
+        self._c2_cal_mode = setting
+        self.apply()  # Pending control changes precede the calibration start
         self._c2_cal_start = True
-        while self._c2_cal_start:
-            time.sleep(0.010)  # 10ms
-        return not self._c2_cal_error
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_async`
+================================================================================
+
+An asyncio wrapper for the CircuitPython NAU7802 24-bit ADC driver. Waits for
+data-ready, multiplexer settling, and calibration completion yield to the
+event loop instead of blocking, so that several ADCs and other tasks such as
+a display can run concurrently.
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Adafruit's asyncio library: https://github.com/adafruit/Adafruit_CircuitPython_asyncio
+* Cedar Grove NAU7802 driver: cedargrove_nau7802
+"""
+
+import asyncio
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+
+class AsyncNAU7802:
+    """Non-blocking access to an instantiated NAU7802. Between data-ready and
+    calibration status checks, yields to the event loop for approximately one
+    conversion period."""
+
+    def __init__(self, nau7802):
+        self._nau7802 = nau7802
+
+    @property
+    def nau7802(self):
+        """The wrapped NAU7802 instance."""
+        return self._nau7802
+
+    @property
+    def _period(self):
+        """The conversion period in seconds."""
+        return 1 / self._nau7802.conversion_rate
+
+    async def read_raw(self):
+        """Wait for the next conversion and return the signed 24-bit value as
+        an integer."""
+        while True:
+            value = self._nau7802.read_raw(check_ready=True)
+            if value is not None:
+                return value
+            await asyncio.sleep(self._period)
+
+    async def read(self):
+        """Wait for the next conversion and return the value as a float, scaled
+        like NAU7802.read()."""
+        while True:
+            value = self._nau7802.read(check_ready=True)
+            if value is not None:
+                return value
+            await asyncio.sleep(self._period)
+
+    async def set_channel(self, chan=1):
+        """Select the active channel (1 or 2) and wait for the analog
+        multiplexer settling time of the current conversion rate."""
+        self._nau7802._select_channel(chan)  # pylint: disable=protected-access
+        await asyncio.sleep(self._nau7802.settling_time)
+
+    async def calibrate(self, mode="INTERNAL", timeout=1.0):
+        """Perform the calibration procedure. Valid calibration modes are
+        'INTERNAL', 'OFFSET', and 'GAIN'. True if successful; False if the
+        calibration error bit is set. Raises RuntimeError if the calibration
+        does not complete within timeout seconds."""
+        self._nau7802.calibrate_start(mode, timeout)
+        while self._nau7802.calibrate_poll() == "RUNNING":
+            await asyncio.sleep(self._period)
+        if self._nau7802.calibration_state == "TIMEOUT":
+            raise RuntimeError("NAU7802 calibration timed out")
+        return self._nau7802.calibration_state == "DONE"
@@ -0,0 +1,220 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_capture`
+================================================================================
+
+A compact binary capture format for NAU7802 24-bit ADC sample streams.
+
+A capture file starts with a 40-byte header followed by 8-byte records. All
+values are little-endian.
+
+Header:
+
+* magic ``b"NAU7"`` and format version (1)
+* number of channels, gain, conversion rate (samples per second)
+* start time (``time.monotonic_ns()`` of the first record's reference)
+* zero offset (int32) and calibration ratio (float32) of channels 1 and 2
+
+Record:
+
+* time since the previous record in microseconds (uint32)
+* raw value shifted left 8 bits, ORed with the channel number (int32)
+
+CaptureWriter appends records in blocks and runs on CircuitPython.
+CaptureReader memory-maps a capture on a host computer and exposes the
+columns as NumPy arrays.
+
+.. code-block:: python
+
+    with open("/sd/capture.bin", "wb") as file:
+        capture = CaptureWriter(file, gain=nau7802.gain, rate=10)
+        for timestamp_ns, channel, raw in nau7802.stream(channels=(1, 2)):
+            capture.write(timestamp_ns, channel, raw)
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* NumPy (CaptureReader only)
+"""
+
+import struct
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+MAGIC = b"NAU7"
+VERSION = 1
+
+_HEADER_FORMAT = "<4sBBHHxxqiiff4x"
+HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)  # 40 bytes
+_RECORD_FORMAT = "<Ii"
+RECORD_SIZE = struct.calcsize(_RECORD_FORMAT)  # 8 bytes
+_MAX_DELTA_US = 0xFFFFFFFF
+
+
+class CaptureWriter:
+    """Writes a capture header to a file opened in binary mode, then appends
+    records in blocks of block_records. zero_offsets and ratios are the
+    calibration of channels 1 and 2, such as LoadCell.zero_offset and
+    LoadCell.ratio. start_ns is the reference time of the first record; the
+    first written timestamp by default. Time between records is limited to
+    about 71 minutes; write() raises ValueError for a longer gap or a
+    timestamp earlier than the previous one."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        file,
+        gain=128,
+        rate=10,
+        active_channels=2,
+        zero_offsets=(0, 0),
+        ratios=(1.0, 1.0),
+        start_ns=None,
+        block_records=64,
+    ):
+        if block_records < 1:
+            raise ValueError("Invalid Block Size")
+        self._file = file
+        self._block = bytearray(block_records * RECORD_SIZE)
+        self._index = 0  # Records in the block
+        self._last_ns = start_ns
+        self._header = (gain, rate, active_channels, zero_offsets, ratios)
+        self._header_written = False
+        self.records = 0  # Records written, including those in the block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.flush()
+
+    def _write_header(self, start_ns):
+        gain, rate, active_channels, zero_offsets, ratios = self._header
+        self._file.write(
+            struct.pack(
+                _HEADER_FORMAT,
+                MAGIC,
+                VERSION,
+                active_channels,
+                gain,
+                rate,
+                start_ns,
+                zero_offsets[0],
+                zero_offsets[1],
+                ratios[0],
+                ratios[1],
+            )
+        )
+        self._header_written = True
+
+    def write(self, timestamp_ns, channel, raw):
+        """Append one sample. The block is written to the file when full.
+        Raises ValueError, without writing the sample, if timestamp_ns is
+        earlier than the previous timestamp or more than about 71 minutes
+        later, since its time could not be reconstructed."""
+        if self._last_ns is None:
+            self._last_ns = timestamp_ns
+        delta = (timestamp_ns - self._last_ns) // 1000
+        if not 0 <= delta <= _MAX_DELTA_US:
+            raise ValueError("Capture timestamp out of range")
+        if not self._header_written:
+            self._write_header(self._last_ns)
+        self._last_ns += delta * 1000  # Carry the sub-microsecond remainder
+        struct.pack_into(
+            _RECORD_FORMAT,
+            self._block,
+            self._index * RECORD_SIZE,
+            delta,
+            (raw << 8) | (channel & 0xFF),
+        )
+        self._index += 1
+        self.records += 1
+        if self._index * RECORD_SIZE == len(self._block):
+            self.flush()
+
+    def flush(self):
+        """Write the partial block to the file."""
+        if not self._header_written:
+            if self._last_ns is None:
+                return
+            self._write_header(self._last_ns)
+        if self._index:
+            self._file.write(memoryview(self._block)[: self._index * RECORD_SIZE])
+            self._index = 0
+        self._file.flush()
+
+
+class CaptureReader:
+    """Memory-maps a capture file on a host computer. The record columns are
+    exposed as NumPy arrays: delta_us is a view of the file; channel, raw and
+    timestamp_ns are computed with vectorized operations. A trailing partial
+    record is ignored."""
+
+    def __init__(self, path):
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            raise ValueError("Not an NAU7802 capture file")
+        fields = struct.unpack(_HEADER_FORMAT, header)
+        if fields[1] != VERSION:
+            raise ValueError("Unsupported capture version: %d" % fields[1])
+        self.active_channels = fields[2]
+        self.gain = fields[3]
+        self.rate = fields[4]
+        self.start_ns = fields[5]
+        self.zero_offsets = fields[6:8]
+        self.ratios = fields[8:10]
+        self._np = np
+        dtype = np.dtype([("delta_us", "<u4"), ("word", "<i4")])
+        with open(path, "rb") as file:
+            file.seek(0, 2)
+            count = (file.tell() - HEADER_SIZE) // RECORD_SIZE
+        if count:
+            self.records = np.memmap(
+                path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,)
+            )
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def delta_us(self):
+        """Microseconds since the previous record."""
+        return self.records["delta_us"]
+
+    @property
+    def timestamp_ns(self):
+        """Record times in nanoseconds on the capture's monotonic clock."""
+        np = self._np
+        return self.start_ns + np.cumsum(self.delta_us, dtype=np.int64) * 1000
+
+    @property
+    def channel(self):
+        """Record channel numbers."""
+        return (self.records["word"] & 0xFF).astype(self._np.uint8)
+
+    @property
+    def raw(self):
+        """Record raw ADC values."""
+        return self.records["word"] >> 8
+
+    def mass(self, channel=1):
+        """Raw values of one channel converted with the header zero offset
+        and calibration ratio."""
+        raw = self.raw[self.channel == channel]
+        return (raw - self.zero_offsets[channel - 1]) * self.ratios[channel - 1]
@@ -0,0 +1,342 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_filters`
+================================================================================
+
+Streaming filters for NAU7802 24-bit ADC samples. Each filter is updated with
+one sample at a time and provides a new filtered value after every
+conversion instead of after a block of samples. Sample history is kept in
+ring buffers preallocated as arrays.
+
+The moving average and median arrays hold 32-bit floats by default, so that
+both read() and read_raw() samples are accepted; values with up to 24
+significant bits, such as raw and read() values, are stored exactly. With
+typecode 'i', the moving average keeps an exact integer running sum of
+read_raw() samples, which avoids float rounding on microcontrollers; 'd'
+holds host samples that need double precision.
+
+.. code-block:: python
+
+    smooth = MovingAverage(100, typecode="i")
+    while True:
+        if nau7802.available():
+            mass = smooth.update(nau7802.read_raw())
+
+measure() collects samples only until the reading has settled:
+
+.. code-block:: python
+
+    value, count, stable = measure(nau7802, tolerance=20)
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+"""
+
+import time
+from array import array
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+_TYPECODES = ("f", "d", "i")  # Sample history array types
+
+
+class MovingAverage:
+    """Running average of the most recent size samples. The running sum is
+    updated in constant time per sample. The sample history is an array of
+    the typecode 'f' (default), 'd', or 'i'; with 'i', integer samples such
+    as raw ADC values are summed exactly."""
+
+    def __init__(self, size=100, typecode="f"):
+        if size < 1:
+            raise ValueError("Invalid Filter Size")
+        if typecode not in _TYPECODES:
+            raise ValueError("Invalid Typecode")
+        self._ring = array(typecode, [0] * size)
+        self.reset()
+
+    def reset(self):
+        """Clear the sample history."""
+        self._index = 0
+        self._count = 0
+        self._sum = 0
+        self._value = None
+
+    @property
+    def value(self):
+        """The current filtered value; None before the first update."""
+        return self._value
+
+    @property
+    def count(self):
+        """Number of samples in the window."""
+        return self._count
+
+    def update(self, sample):
+        """Add a sample. Returns the average of the samples in the window."""
+        ring = self._ring
+        if self._count == len(ring):
+            self._sum -= ring[self._index]
+        else:
+            self._count += 1
+        ring[self._index] = sample
+        self._sum += sample
+        self._index = (self._index + 1) % len(ring)
+        self._value = self._sum / self._count
+        return self._value
+
+
+class MovingMedian:
+    """Running median of the most recent size samples. Keeps a sorted copy of
+    the window; the outgoing and incoming samples are located with a binary
+    search and moved with in-place shifts, so that an update never sorts or
+    allocates. Intended for small windows. The window arrays use the typecode
+    'f' (default), 'd', or 'i'."""
+
+    def __init__(self, size=15, typecode="f"):
+        if size < 1:
+            raise ValueError("Invalid Filter Size")
+        if typecode not in _TYPECODES:
+            raise ValueError("Invalid Typecode")
+        self._ring = array(typecode, [0] * size)
+        self._sorted = array(typecode, [0] * size)
+        self.reset()
+
+    def reset(self):
+        """Clear the sample history."""
+        self._index = 0
+        self._count = 0
+        self._value = None
+
+    @property
+    def value(self):
+        """The current filtered value; None before the first update."""
+        return self._value
+
+    @property
+    def count(self):
+        """Number of samples in the window."""
+        return self._count
+
+    def _search(self, sample, count):
+        """Index of the first sorted entry not less than sample."""
+        ordered = self._sorted
+        low = 0
+        high = count
+        while low < high:
+            mid = (low + high) // 2
+            if ordered[mid] < sample:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def update(self, sample):
+        """Add a sample. Returns the median of the samples in the window."""
+        ring = self._ring
+        ordered = self._sorted
+        count = self._count
+        if count == len(ring):
+            # Remove the outgoing sample from the sorted window
+            old = self._search(ring[self._index], count)
+            count -= 1
+            for i in range(old, count):
+                ordered[i] = ordered[i + 1]
+        new = self._search(sample, count)
+        for i in range(count, new, -1):
+            ordered[i] = ordered[i - 1]
+        ordered[new] = sample
+        count += 1
+        self._count = count
+        ring[self._index] = sample
+        self._index = (self._index + 1) % len(ring)
+        mid = count // 2
+        if count % 2:
+            self._value = ordered[mid]
+        else:
+            self._value = (ordered[mid - 1] + ordered[mid]) / 2
+        return self._value
+
+
+class ExponentialSmoothing:
+    """Exponential moving average with smoothing factor alpha between 0 and 1.
+    Larger alpha values follow changes faster."""
+
+    def __init__(self, alpha=0.1):
+        if not 0 < alpha <= 1:
+            raise ValueError("Invalid Smoothing Factor")
+        self._alpha = alpha
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._value = None
+
+    @property
+    def value(self):
+        """The current filtered value; None before the first update."""
+        return self._value
+
+    def update(self, sample):
+        """Add a sample. Returns the smoothed value."""
+        if self._value is None:
+            self._value = float(sample)
+        else:
+            self._value += self._alpha * (sample - self._value)
+        return self._value
+
+
+class Kalman1D:
+    """One-dimensional Kalman filter for a slowly changing value such as a
+    load cell reading. process_variance is the expected variance of the true
+    value between samples and measurement_variance the variance of the ADC
+    noise, both in squared counts."""
+
+    def __init__(self, process_variance=1.0, measurement_variance=100.0):
+        if process_variance < 0 or measurement_variance <= 0:
+            raise ValueError("Invalid Variance")
+        self._q = process_variance
+        self._r = measurement_variance
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._value = None
+        self._p = 0.0  # Estimate variance
+
+    @property
+    def value(self):
+        """The current estimate; None before the first update."""
+        return self._value
+
+    @property
+    def variance(self):
+        """The variance of the current estimate."""
+        return self._p
+
+    def update(self, sample):
+        """Add a sample. Returns the updated estimate."""
+        if self._value is None:
+            self._value = float(sample)
+            self._p = self._r
+            return self._value
+        p = self._p + self._q
+        gain = p / (p + self._r)
+        self._value += gain * (sample - self._value)
+        self._p = (1 - gain) * p
+        return self._value
+
+
+class StabilityDetector:
+    """Running variance and slope of the most recent window samples, updated in
+    constant time per sample. The reading is stable when the window is full,
+    the standard error of the window mean is within tolerance, and the means of
+    the older and newer halves of the window differ by no more than tolerance.
+    """
+
+    def __init__(self, tolerance, window=16):
+        if window < 2:
+            raise ValueError("Invalid Window Size")
+        self._tolerance = tolerance
+        self._ring = array("i", [0] * window)
+        self._half = window // 2
+        self.reset()
+
+    def reset(self):
+        """Clear the sample history."""
+        self._index = 0  # Oldest sample once the window is full
+        self._count = 0
+        self._sum = 0
+        self._sum_sq = 0
+        self._older = 0  # Sum of the oldest half of the window
+        self._newer = 0  # Sum of the newest half of the window
+
+    @property
+    def count(self):
+        """Number of samples in the window."""
+        return self._count
+
+    @property
+    def mean(self):
+        """Mean of the samples in the window; None when empty."""
+        if not self._count:
+            return None
+        return self._sum / self._count
+
+    @property
+    def stable(self):
+        """True when the window is full and within tolerance."""
+        size = len(self._ring)
+        if self._count < size:
+            return False
+        variance = (self._sum_sq - self._sum * self._sum / size) / (size - 1)
+        if variance > self._tolerance * self._tolerance * size:
+            return False  # Standard error of the mean exceeds tolerance
+        drift = self._newer / (size - self._half) - self._older / self._half
+        return abs(drift) <= self._tolerance
+
+    def update(self, sample):
+        """Add a sample. Returns the stable state."""
+        ring = self._ring
+        size = len(ring)
+        index = self._index
+        if self._count == size:
+            old = ring[index]
+            middle = ring[(index + self._half) % size]
+            self._sum -= old
+            self._sum_sq -= old * old
+            self._older += middle - old
+            self._newer += sample - middle
+        else:
+            self._count += 1
+            if self._count > self._half:
+                self._newer += sample
+            else:
+                self._older += sample
+        ring[index] = sample
+        self._sum += sample
+        self._sum_sq += sample * sample
+        self._index = (index + 1) % size
+        return self.stable
+
+
+# pylint: disable=too-many-arguments
+def measure(nau7802, tolerance=10, window=16, max_samples=1000, timeout=None):
+    """Read fresh raw samples from an NAU7802 until the reading is stable
+    within tolerance counts (see StabilityDetector), max_samples have been
+    read, or timeout seconds have elapsed. The default timeout is twice the
+    time max_samples conversions take at the NAU7802 conversion rate. After
+    each sample the loop sleeps for most of a conversion period, then checks
+    data-ready every sixteenth of a period.
+    Returns a (value, count, stable) tuple with the mean of the most recent
+    window samples, the number of samples read, and the stable state."""
+    period = 1 / nau7802.conversion_rate
+    if timeout is None:
+        timeout = 2 * max_samples * period
+    detector = StabilityDetector(tolerance, window)
+    start = time.monotonic()
+    count = 0
+    stable = False
+    while count < max_samples:
+        value = nau7802.read_raw(check_ready=True)
+        if value is None:
+            if time.monotonic() - start > timeout:
+                break
+            time.sleep(period / 16)
+            continue
+        count += 1
+        stable = detector.update(value)
+        if stable:
+            break
+        time.sleep(period * 7 / 8)
+    return detector.mean, count, stable
@@ -0,0 +1,268 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_host`
+================================================================================
+
+Host-side acquisition for Linux single board computers running the NAU7802
+driver under Blinka. One worker process per I2C bus or device reads samples
+into a shared memory ring buffer so that acquisition on separate buses runs
+in parallel and is not stalled by the analysis code. Consumers copy new
+samples out of the ring with read_copy(), which detects records that the
+worker overwrote during the copy, or read them in place as NumPy views.
+
+The worker process instantiates its own NAU7802 by calling a factory
+function, because bus objects cannot be passed between processes. The factory
+must be a module-level function so that it can be pickled.
+
+.. code-block:: python
+
+    def load_cell_1():
+        return NAU7802(busio.I2C(board.SCL, board.SDA), active_channels=2)
+
+    with AcquisitionService((load_cell_1, load_cell_2)) as service:
+        cursor = 0
+        while True:
+            samples, cursor, lost = service.rings[0].read_copy(cursor)
+            if len(samples):
+                print(samples["raw"].mean())
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* CPython 3.8 or later on Linux with Adafruit Blinka
+
+* NumPy
+
+* Cedar Grove NAU7802 driver: cedargrove_nau7802
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+# One sample record: monotonic time, channel number and raw ADC value
+SAMPLE_DTYPE = np.dtype([("timestamp_ns", "<i8"), ("channel", "<i4"), ("raw", "<i4")])
+
+_HEADER = 16  # Bytes before the records: written sample count and capacity
+
+
+class SampleRing:
+    """A single-writer ring buffer of SAMPLE_DTYPE records in shared memory.
+    Create with capacity records, or attach to an existing ring by name.
+
+    The writer stores each record before advancing the written sample count,
+    but there is no lock or memory barrier between the processes. The writer
+    may overwrite the oldest records while a reader uses them, which
+    read_copy() detects by checking the count again after copying. On weakly
+    ordered CPUs such as ARM, a reader may also see the new count before the
+    stores of the newest record; that record can then be incomplete. Leave
+    the newest record for the next read if this matters."""
+
+    def __init__(self, capacity=4096, name=None):
+        if name is None:
+            if capacity < 1:
+                raise ValueError("Invalid Ring Capacity")
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=_HEADER + capacity * SAMPLE_DTYPE.itemsize
+            )
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._header = np.ndarray((2,), dtype="<i8", buffer=self._shm.buf)
+        if self._owner:
+            self._header[:] = (0, capacity)
+        self._records = np.ndarray(
+            (int(self._header[1]),),
+            dtype=SAMPLE_DTYPE,
+            buffer=self._shm.buf,
+            offset=_HEADER,
+        )
+
+    @property
+    def name(self):
+        """The shared memory block name used to attach from another
+        process."""
+        return self._shm.name
+
+    @property
+    def capacity(self):
+        """Maximum number of records held before the oldest are
+        overwritten."""
+        return len(self._records)
+
+    @property
+    def count(self):
+        """Total number of samples written since the ring was created."""
+        return int(self._header[0])
+
+    @property
+    def records(self):
+        """The ring storage as a NumPy view; record i is at index i modulo
+        capacity."""
+        return self._records
+
+    def write(self, timestamp_ns, channel, raw):
+        """Append one sample, overwriting the oldest when full."""
+        count = self._header[0]
+        record = self._records[count % len(self._records)]
+        record["timestamp_ns"] = timestamp_ns
+        record["channel"] = channel
+        record["raw"] = raw
+        self._header[0] = count + 1
+
+    def read(self, cursor=0):
+        """The samples written since cursor, a previous count, as a list of
+        up to two NumPy views in time order. Returns a (views, cursor, lost)
+        tuple with the new cursor and the number of samples that were
+        overwritten before they could be read. The views refer to the live
+        shared memory: the writer overwrites each record capacity samples
+        later, including while the views are in use. Use read_copy() to get
+        records that are checked against overwriting."""
+        count = self.count
+        capacity = len(self._records)
+        lost = max(count - cursor - capacity, 0)
+        start = cursor + lost
+        if start == count:
+            return [], count, lost
+        first = start % capacity
+        last = count % capacity
+        if first < last:
+            views = [self._records[first:last]]
+        else:
+            views = [self._records[first:], self._records[:last]]
+            if not last:
+                views.pop()
+        return views, count, lost
+
+    def read_copy(self, cursor=0):
+        """The samples written since cursor, a previous count, copied into a
+        new array in time order. Returns a (samples, cursor, lost) tuple with
+        the new cursor and the number of samples that were overwritten before
+        or while they were copied; overwritten samples are not returned.
+        The slot the writer stores next counts as overwritten, so at most
+        capacity - 1 samples are returned."""
+        count = self.count
+        start = max(cursor, count - len(self._records))
+        samples, start = self._copy(start, count)
+        return samples, count, start - cursor
+
+    def latest(self, samples):
+        """The most recent samples records as a new array in time order.
+        Records overwritten while they were copied are left out."""
+        count = self.count
+        start = count - min(samples, count, len(self._records))
+        return self._copy(start, count)[0]
+
+    def _copy(self, start, count):
+        """Copy records start to count, then drop the leading records that
+        the writer may have overwritten meanwhile: the writer is storing
+        record self.count into the slot of record self.count - capacity.
+        Returns the copy and the index of its first record."""
+        capacity = len(self._records)
+        copied = self._records[np.arange(start, count) % capacity]
+        overwritten = self.count - capacity + 1 - start
+        if overwritten > 0:
+            copied = copied[overwritten:]
+            start = min(start + overwritten, count)
+        return copied, start
+
+    def close(self):
+        """Release the shared memory; the creating ring also unlinks it."""
+        self._header = None
+        self._records = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _acquire(factory, ring_name, channels, samples_per_switch, stop):
+    """Worker process: stream samples from the NAU7802 returned by factory
+    into the named ring until stop is set."""
+    ring = SampleRing(name=ring_name)
+    try:
+        nau7802 = factory()
+        for timestamp_ns, channel, raw in nau7802.stream(
+            channels=channels, samples_per_switch=samples_per_switch
+        ):
+            ring.write(timestamp_ns, channel, raw)
+            if stop.is_set():
+                break
+    finally:
+        ring.close()
+
+
+class AcquisitionService:
+    """Runs one acquisition worker process for each NAU7802 factory function,
+    each writing to its own SampleRing of capacity records. channels and
+    samples_per_switch are passed to NAU7802.stream(). Workers are started by
+    start() or by entering a with block."""
+
+    def __init__(self, factories, capacity=4096, channels=None, samples_per_switch=10):
+        self._factories = tuple(factories)
+        self._channels = channels
+        self._samples_per_switch = samples_per_switch
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self.rings = tuple(SampleRing(capacity) for _ in self._factories)
+        self._workers = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @property
+    def running(self):
+        """True while every worker process is running."""
+        return bool(self._workers) and all(w.is_alive() for w in self._workers)
+
+    def start(self):
+        """Start the worker processes."""
+        if self._workers:
+            raise RuntimeError("Acquisition already started")
+        self._stop.clear()
+        for factory, ring in zip(self._factories, self.rings):
+            worker = self._context.Process(
+                target=_acquire,
+                args=(
+                    factory,
+                    ring.name,
+                    self._channels,
+                    self._samples_per_switch,
+                    self._stop,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout=2.0):
+        """Stop the worker processes; workers that do not finish within
+        timeout seconds are terminated."""
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._workers = []
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        self.stop()
+        for ring in self.rings:
+            ring.close()
@@ -0,0 +1,181 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_loadcell`
+================================================================================
+
+A load cell abstraction for one NAU7802 24-bit ADC channel. Owns the zero
+offset (tare), the calibration ratio, and the mass units. The calibration
+ratio is stored as a precomputed fixed-point multiplier and shift so that
+converting a raw sample to mass is an integer multiply and shift. The raw
+difference from the zero offset is multiplied in two 12-bit parts, so that no
+intermediate product exceeds CircuitPython's 31-bit small integers.
+
+.. code-block:: python
+
+    scale = LoadCell(nau7802, channel=1)
+    scale.zero()  # Remove all weight first
+    scale.calibrate(100)  # Place a 100 gram weight
+    while True:
+        print(scale.read())
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Cedar Grove NAU7802 driver: cedargrove_nau7802
+"""
+
+from array import array
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+# Mass units per gram for each supported mass unit
+_UNITS = {"g": 1.0, "oz": 1 / 28.349523125}
+
+_MULTIPLIER_BITS = 15  # Significant bits of the fixed-point multiplier
+_MAX_SHIFT = 28  # Keeps the rounding term and partial sums within 30 bits
+_SPLIT_BITS = 12  # Low part of the raw difference; 12 + 15 bit products
+_SPLIT_MASK = (1 << _SPLIT_BITS) - 1
+
+
+class LoadCell:
+    """A load cell connected to one channel of an NAU7802. The calibration
+    ratio is in grams per raw count (NAU7802.read_raw() units); ratios
+    determined with NAU7802.read() values, such as the examples' CALIB_RATIO,
+    are multiplied by 2. Valid units are 'g' and 'oz'."""
+
+    def __init__(self, nau7802, channel=1, ratio=1.0, zero_offset=0, units="g"):
+        self._nau7802 = nau7802
+        self._channel = channel
+        self._zero = zero_offset
+        if units not in _UNITS:
+            raise ValueError("Invalid Mass Units")
+        self._units = units
+        self._buffer = array("i")
+        self.ratio = ratio
+
+    @property
+    def channel(self):
+        """The NAU7802 channel number of the load cell."""
+        return self._channel
+
+    @property
+    def zero_offset(self):
+        """The raw value with no load (tare)."""
+        return self._zero
+
+    @zero_offset.setter
+    def zero_offset(self, raw=0):
+        self._zero = raw
+
+    @property
+    def ratio(self):
+        """The calibration ratio in grams per raw count."""
+        return self._ratio
+
+    @ratio.setter
+    def ratio(self, grams_per_count=1.0):
+        if not grams_per_count:
+            raise ValueError("Invalid Calibration Ratio")
+        self._ratio = grams_per_count
+        self._scale()
+
+    @property
+    def units(self):
+        """The mass units, 'g' or 'oz'."""
+        return self._units
+
+    @units.setter
+    def units(self, units="g"):
+        if units not in _UNITS:
+            raise ValueError("Invalid Mass Units")
+        self._units = units
+        self._scale()
+
+    def _scale(self):
+        """Precompute the fixed-point multiplier and shift that convert raw
+        counts to milliunits of mass."""
+        milliunits = self._ratio * 1000 * _UNITS[self._units]
+        shift = 0
+        while shift < _MAX_SHIFT and abs(milliunits) * (1 << shift) < (
+            1 << (_MULTIPLIER_BITS - 1)
+        ):
+            shift += 1
+        self._multiplier = round(milliunits * (1 << shift))
+        self._shift = shift
+        self._round = (1 << shift) >> 1
+
+    def milliunits(self, raw):
+        """Convert a raw sample to an integer mass in milligrams or
+        thousandths of an ounce, rounded to nearest."""
+        delta = raw - self._zero
+        high = (delta >> _SPLIT_BITS) * self._multiplier
+        low = (delta & _SPLIT_MASK) * self._multiplier + self._round
+        if self._shift >= _SPLIT_BITS:
+            return (high + (low >> _SPLIT_BITS)) >> (self._shift - _SPLIT_BITS)
+        return (high << (_SPLIT_BITS - self._shift)) + (low >> self._shift)
+
+    def mass(self, raw):
+        """Convert a raw sample to mass in the selected units."""
+        return self.milliunits(raw) / 1000
+
+    def _select(self):
+        if self._nau7802.channel != self._channel:
+            self._nau7802.channel = self._channel
+
+    def read_average(self, samples=100):
+        """Select the channel and return the average of samples fresh raw
+        values."""
+        if len(self._buffer) < samples:
+            self._buffer = array("i", [0] * samples)
+        self._select()
+        count, _ = self._nau7802.read_into(self._buffer, samples)
+        if not count:
+            raise RuntimeError("NAU7802 conversion timed out")
+        total = 0
+        for i in range(count):
+            total += self._buffer[i]
+        return total // count
+
+    def read(self, samples=1):
+        """Select the channel and return the mass of the average of samples
+        fresh raw values in the selected units."""
+        return self.mass(self.read_average(samples))
+
+    def zero(self, samples=100, calibrate=True):
+        """Set the zero offset from the average of samples raw values. Remove
+        all weight and tare from the load cell first. If calibrate is True, the
+        NAU7802 internal and offset calibrations are run first; RuntimeError is
+        raised if either fails. Returns the zero offset."""
+        self._select()
+        if calibrate:
+            for mode in ("INTERNAL", "OFFSET"):
+                if not self._nau7802.calibrate(mode):
+                    raise RuntimeError("NAU7802 calibration failed")
+        self._zero = self.read_average(samples)
+        return self._zero
+
+    def calibrate(self, mass, samples=100):
+        """Set the calibration ratio from the average of samples raw values
+        with a known mass in grams on the load cell, using the zero offset as
+        the second calibration point. Returns the calibration ratio."""
+        self.calibrate_points(self._zero, 0, self.read_average(samples), mass)
+        return self._ratio
+
+    def calibrate_points(self, raw_1, mass_1, raw_2, mass_2):
+        """Two-point calibration from raw values measured with two known masses
+        in grams. Sets the calibration ratio and the zero offset."""
+        if raw_1 == raw_2:
+            raise ValueError("Calibration points must differ")
+        self.ratio = (mass_2 - mass_1) / (raw_2 - raw_1)
+        self._zero = round(raw_1 - mass_1 / self._ratio)
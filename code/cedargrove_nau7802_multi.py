@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_multi`
+================================================================================
+
+Manages several NAU7802 24-bit ADCs connected to the ports of a TCA9548A-style
+I2C multiplexer. Every NAU7802 uses the fixed 0x2A address, so only one
+multiplexer port can be enabled at a time. The manager caches the selected
+port to skip redundant selection writes and checks one device at a time,
+when it is expected to have a new conversion, so that the multiplexer is
+only switched to a port that is about to deliver a sample.
+
+.. code-block:: python
+
+    adcs = NAU7802Manager(board.I2C(), ports=(0, 1, 2, 3))
+    for timestamp_ns, port, channel, raw in adcs.stream():
+        print(port, channel, raw)
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Hardware:**
+
+* TCA9548A I2C multiplexer or compatible
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Cedar Grove NAU7802 driver: cedargrove_nau7802
+"""
+
+import time
+
+from cedargrove_nau7802 import NAU7802
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+
+class _MuxPort:
+    """A busio.I2C-compatible view of one multiplexer port. The port is
+    selected when the bus is locked unless it is already selected."""
+
+    def __init__(self, manager, port):
+        self._manager = manager
+        self._select = bytes((1 << port,))
+        self._port = port
+
+    def try_lock(self):
+        """Lock the bus and select the port if it is not selected."""
+        manager = self._manager
+        if not manager.i2c.try_lock():
+            return False
+        if manager.selected_port != self._port:
+            manager.i2c.writeto(manager.mux_address, self._select)
+            manager.selected_port = self._port
+            manager.selects += 1
+        return True
+
+    def unlock(self):
+        """Unlock the bus."""
+        self._manager.i2c.unlock()
+
+    def scan(self):
+        """Scan the bus for device addresses."""
+        return self._manager.i2c.scan()
+
+    def writeto(self, address, buffer, **kwargs):
+        """Write to a device on the port."""
+        self._manager.i2c.writeto(address, buffer, **kwargs)
+
+    def readfrom_into(self, address, buffer, **kwargs):
+        """Read from a device on the port."""
+        self._manager.i2c.readfrom_into(address, buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address, out_buffer, in_buffer, **kwargs):
+        """Write then read a device on the port with a repeated start."""
+        self._manager.i2c.writeto_then_readfrom(
+            address, out_buffer, in_buffer, **kwargs
+        )
+
+
+# pylint: disable=too-many-instance-attributes
+class NAU7802Manager:
+    """Instantiates an NAU7802 on each listed multiplexer port. Additional
+    keyword arguments such as active_channels are passed to each NAU7802.
+    The optional drdy sequence provides a DRDY pin object for each port."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, i2c_bus, ports=(0, 1), mux_address=0x70, drdy=None, **kwargs):
+        self.i2c = i2c_bus
+        self.mux_address = mux_address
+        self.selected_port = None  # Unknown until the first selection
+        self.selects = 0  # Number of port selection writes
+        self.ports = tuple(ports)
+        if drdy is None:
+            drdy = (None,) * len(self.ports)
+        self.devices = tuple(
+            NAU7802(_MuxPort(self, port), drdy=pin, **kwargs)
+            for port, pin in zip(self.ports, drdy)
+        )
+        self._due = [0] * len(self.devices)  # Next data-ready check (ns)
+        self._waiting = None  # Index of the device the port stays on
+        self._give_up = 0  # End of the stay on the waiting device (ns)
+
+    def __getitem__(self, index):
+        return self.devices[index]
+
+    def __len__(self):
+        return len(self.devices)
+
+    def _check_index(self):
+        """The index of the device to check next: the device the port stays
+        on, otherwise the device that is due soonest."""
+        if self._waiting is not None:
+            return self._waiting
+        due = self._due
+        return due.index(min(due))
+
+    def poll(self):
+        """Check the device that is due soonest for a new conversion, if its
+        check is due. A device with a new conversion is next checked shortly
+        before its following conversion. A device that is not ready yet keeps
+        the multiplexer port and is checked again after a sixteenth of its
+        conversion period, for up to a quarter period, before the other
+        devices are checked. Returns a (timestamp_ns, port, channel, raw)
+        tuple, or None if the device is not ready or no check is due."""
+        index = self._check_index()
+        due = self._due
+        now = time.monotonic_ns()
+        if now < due[index]:
+            return None
+        device = self.devices[index]
+        period = 1_000_000_000 // device.conversion_rate
+        value = device.read_raw(check_ready=True)
+        now = time.monotonic_ns()
+        if value is None:
+            if self._waiting is None:
+                self._waiting = index
+                self._give_up = now + period // 4
+            elif now > self._give_up:
+                self._waiting = None  # Late; let the other devices be checked
+                due[index] = now + period * 7 // 8
+                return None
+            due[index] = now + period // 16
+            return None
+        self._waiting = None
+        due[index] = now + period * 7 // 8
+        return (now, self.ports[index], device.channel, value)
+
+    def _wait(self):
+        """Sleep until the next data-ready check is due."""
+        wait = self._due[self._check_index()] - time.monotonic_ns()
+        if wait > 0:
+            time.sleep(wait / 1_000_000_000)
+
+    def stream(self):
+        """A generator that continuously yields (timestamp_ns, port, channel,
+        raw) tuples from all devices as conversions become ready, sleeping
+        between data-ready checks."""
+        poll = self.poll
+        while True:
+            sample = poll()
+            if sample is None:
+                self._wait()
+            else:
+                yield sample
+
+    def read_all(self, timeout=1.0):
+        """Wait for one new conversion from every device. Returns a list of raw
+        values in port order; None for a device without a new conversion
+        within timeout seconds. Pending devices are checked every sixteenth of
+        the shortest conversion period."""
+        values = [None] * len(self.devices)
+        pending = len(self.devices)
+        pause = 1 / (16 * max(device.conversion_rate for device in self.devices))
+        deadline = time.monotonic() + timeout
+        while pending and time.monotonic() < deadline:
+            for index, device in enumerate(self.devices):
+                if values[index] is None:
+                    values[index] = device.read_raw(check_ready=True)
+                    if values[index] is not None:
+                        pending -= 1
+            if pending:
+                time.sleep(pause)
+        return values
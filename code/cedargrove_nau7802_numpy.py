@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_numpy`
+================================================================================
+
+Vectorized host-side conversion and statistics for buffers of raw NAU7802
+24-bit ADC samples. Replaces the per-sample loops of the examples with NumPy
+operations over whole buffers, such as array('i') buffers filled by
+NAU7802.read_into(), SampleRing views, CaptureReader columns, or raw bytes.
+
+.. code-block:: python
+
+    raw = as_raw(buffer)
+    mass = to_mass(raw, zero_offset=chan_1_zero, ratio=CALIB_RATIO_1 * 2)
+    stats = window_stats(mass, window=100)
+    print(stats["mean"], stats["std"])
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* CPython with NumPy 1.20 or later
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+FULL_SCALE = 2**23 - 1  # Largest positive 24-bit conversion value
+
+# Statistics of one window of samples
+STATS_DTYPE = np.dtype(
+    [("mean", "<f8"), ("std", "<f8"), ("min", "<f8"), ("max", "<f8")]
+)
+
+
+def as_raw(buffer, packed=False):
+    """A NumPy int32 array of the raw values in buffer, without copying when
+    possible. buffer may be an ndarray, an array('i') or other typed buffer,
+    or bytes of native 32-bit integers. If packed is True, buffer holds
+    3-byte big-endian two's complement values as read from the ADCO_B2,
+    ADCO_B1 and ADCO_B0 registers; these are sign-extended into a new
+    array."""
+    if packed:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        if len(data) % 3:
+            raise ValueError("Packed buffer length is not a multiple of 3")
+        data = data.reshape(-1, 3).astype(np.int32)
+        value = (data[:, 0] << 16) | (data[:, 1] << 8) | data[:, 2]
+        return value - ((value & 0x800000) << 1)
+    if isinstance(buffer, (bytes, bytearray)):
+        return np.frombuffer(buffer, dtype=np.int32)
+    return np.asarray(buffer).astype(np.int32, copy=False)
+
+
+def to_mass(raw, zero_offset=0, ratio=1.0, channels=None):
+    """Calibrated mass for each raw value: (raw - zero_offset) * ratio. With
+    a channels array of 1 or 2 for each sample, zero_offset and ratio are the
+    per-channel (channel 1, channel 2) sequences, such as a CaptureReader's
+    channel, zero_offsets and ratios."""
+    raw = np.asarray(raw)
+    if channels is not None:
+        index = np.asarray(channels) - 1
+        zero_offset = np.asarray(zero_offset)[index]
+        ratio = np.asarray(ratio, dtype=np.float64)[index]
+    return (raw - zero_offset) * ratio
+
+
+def percent_full_scale(raw):
+    """Each raw value as a percentage of the positive 24-bit full scale."""
+    return np.asarray(raw) * (100 / FULL_SCALE)
+
+
+def window_stats(values, window=100, step=None):
+    """Mean, population standard deviation, minimum and maximum of each
+    window of values samples, starting every step samples; by default the
+    windows do not overlap. A trailing partial window is ignored. Returns a
+    STATS_DTYPE array with one entry per window."""
+    values = np.asarray(values)
+    if window < 1:
+        raise ValueError("Invalid Window Size")
+    if step is None:
+        step = window
+    if len(values) < window:
+        return np.zeros(0, dtype=STATS_DTYPE)
+    windows = sliding_window_view(values, window)[::step]
+    stats = np.empty(len(windows), dtype=STATS_DTYPE)
+    stats["mean"] = windows.mean(axis=1)
+    stats["std"] = windows.std(axis=1)
+    stats["min"] = windows.min(axis=1)
+    stats["max"] = windows.max(axis=1)
+    return stats
+
+
+def summary(values):
+    """Mean, population standard deviation, minimum and maximum of all
+    values as a single STATS_DTYPE entry."""
+    if not len(values):
+        raise ValueError("No samples")
+    return window_stats(values, window=len(values))[0]
@@ -0,0 +1,405 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""
+`cedargrove_nau7802_replay`
+================================================================================
+
+Replays a recorded NAU7802 capture (see cedargrove_nau7802_capture) through
+the NAU7802 driver interface so that filters, tare logic, and alerting can be
+tested offline with real load cell recordings.
+
+The replay runs on a virtual clock in capture time. With speed=1.0 samples
+become available as they were recorded; speed=N replays N times faster; with
+speed=None the virtual clock jumps directly to the next sample so that a
+capture is processed as fast as possible. Reading returns the most recent
+recorded conversion of the selected channel; conversions passed over are
+counted as missed. After a channel change, recorded samples of the new
+channel within the settling time are not available, as on the device.
+
+.. code-block:: python
+
+    nau7802 = ReplayNAU7802("capture.bin", speed=None)
+    scale = LoadCell(nau7802, channel=1)
+    while not nau7802.finished:
+        print(scale.read())
+
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* CPython with NumPy
+
+* Cedar Grove NAU7802 driver: cedargrove_nau7802
+
+* Cedar Grove NAU7802 capture format: cedargrove_nau7802_capture
+"""
+
+import time
+
+import numpy as np
+
+from cedargrove_nau7802 import _CALIBRATION_MODES, _CONV_RATES, _GAINS, _LDO_VOLTAGES
+from cedargrove_nau7802_capture import CaptureReader
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/Cedargrove_CircuitPython_NAU7802.git"
+
+
+class ReplayNAU7802:
+    """Serves the samples of a capture file or CaptureReader with the NAU7802
+    interface. speed is the replay rate relative to real time, or None for as
+    fast as possible. Raises EOFError when a sample is read after the end of
+    the capture; stream() and read_into() stop instead. Settings are validated
+    with the NAU7802 driver's tables."""
+
+    def __init__(self, capture, speed=1.0):
+        if not isinstance(capture, CaptureReader):
+            capture = CaptureReader(capture)
+        if speed is not None and speed <= 0:
+            raise ValueError("Invalid Replay Speed")
+        if capture.rate not in _CONV_RATES:
+            raise ValueError("Invalid Conversion Rate")
+        self._capture = capture
+        self._speed = speed
+        self._act_channels = max(capture.active_channels, 1)
+        self._gain = capture.gain
+        self._conversion_rate = capture.rate
+        self._ldo_voltage = "3V0"
+        timestamps = capture.timestamp_ns
+        channels = capture.channel
+        raw = capture.raw
+        self._times = {}
+        self._raws = {}
+        for chan in (1, 2):
+            mask = channels == chan
+            self._times[chan] = timestamps[mask]
+            self._raws[chan] = np.ascontiguousarray(raw[mask], dtype=np.int32)
+        self._next = {1: 0, 2: 0}  # Index of the oldest unread sample
+        self._origin_ns = int(timestamps[0]) if len(timestamps) else 0
+        self._wall_ns = time.monotonic_ns()
+        self._channel = 1 if len(self._times[1]) or not len(self._times[2]) else 2
+        self._last_raw = 0
+        self._strict = None
+        self._calib_mode = None
+        self._cal_started = None
+        self._cal_ended = None
+        self.reset_sample_counts()
+
+    @property
+    def speed(self):
+        """Replay rate relative to real time; None for as fast as
+        possible."""
+        return self._speed
+
+    @property
+    def capture_ns(self):
+        """The current replay position in capture time (nanoseconds)."""
+        if self._speed is None:
+            return self._origin_ns
+        elapsed = time.monotonic_ns() - self._wall_ns
+        return self._origin_ns + int(elapsed * self._speed)
+
+    def _advance(self, capture_ns):
+        """Move the replay position forward to capture_ns."""
+        if self._speed is None:
+            self._origin_ns = max(self._origin_ns, capture_ns)
+            return
+        delay = capture_ns - self.capture_ns
+        if delay > 0:
+            time.sleep(delay / self._speed / 1e9)
+
+    def _sleep(self, seconds):
+        """Wait for seconds of capture time."""
+        self._advance(self.capture_ns + int(seconds * 1e9))
+
+    @property
+    def finished(self):
+        """True when no samples of the selected channel remain."""
+        return self._next[self._channel] >= len(self._times[self._channel])
+
+    @property
+    def chip_revision(self):
+        """The chip revision code."""
+        return "15"
+
+    @property
+    def channel(self):
+        """Selected channel number (1 or 2)."""
+        return self._channel
+
+    @channel.setter
+    def channel(self, chan=1):
+        """Select the active channel and wait for the analog multiplexer
+        settling time in capture time."""
+        self._select_channel(chan)
+        self._sleep(self.settling_time)
+
+    def _select_channel(self, chan):
+        if chan not in (1, 2) or chan > self._act_channels:
+            raise ValueError("Invalid Channel Number")
+        self._channel = chan
+        settled = self.capture_ns + int(self.settling_time * 1e9)
+        self._next[chan] = int(np.searchsorted(self._times[chan], settled))
+
+    @property
+    def conversion_rate(self):
+        """The recorded ADC conversion rate in samples per second."""
+        return self._conversion_rate
+
+    @conversion_rate.setter
+    def conversion_rate(self, rate=10):
+        if rate not in _CONV_RATES:
+            raise ValueError("Invalid Conversion Rate")
+        if rate != self._conversion_rate:
+            raise ValueError("Capture recorded at %d SPS" % self._conversion_rate)
+
+    @property
+    def settling_time(self):
+        """The analog multiplexer settling time in seconds for the recorded
+        conversion rate."""
+        return _CONV_RATES[self._conversion_rate][1]
+
+    @property
+    def settling_conversions(self):
+        """The number of conversions to discard after a channel change."""
+        return -(-int(self.settling_time * 1000) * self._conversion_rate // 1000)
+
+    @property
+    def ldo_voltage(self):
+        """Representation of the LDO voltage value."""
+        return self._ldo_voltage
+
+    @ldo_voltage.setter
+    def ldo_voltage(self, voltage="EXTERNAL"):
+        if voltage not in _LDO_VOLTAGES:
+            raise ValueError("Invalid LDO Voltage")
+        self._ldo_voltage = voltage
+
+    @property
+    def gain(self):
+        """The recorded programmable amplifier (PGA) gain factor."""
+        return self._gain
+
+    @gain.setter
+    def gain(self, factor=1):
+        if factor not in _GAINS:
+            raise ValueError("Invalid Gain Factor")
+        if factor != self._gain:
+            raise ValueError("Capture recorded at gain %d" % self._gain)
+
+    def enable(self, power=True, timeout=1.0):
+        """Replay devices are always powered. Returns power."""
+        return power
+
+    def reset(self, timeout=1.0):
+        """Replay devices are always ready. Returns True."""
+        return True
+
+    def _fresh_index(self):
+        """Index of the most recent unread sample of the selected channel
+        available at the replay position; None if there is none."""
+        chan = self._channel
+        first = self._next[chan]
+        times = self._times[chan]
+        if first >= len(times):
+            return None
+        if self._speed is None:
+            return first
+        latest = int(np.searchsorted(times, self.capture_ns, side="right")) - 1
+        if latest < first:
+            return None
+        return latest
+
+    def available(self):
+        """True when a new recorded conversion of the selected channel is
+        available."""
+        return self._fresh_index() is not None
+
+    @property
+    def strict(self):
+        """Stale sample handling mode: None, 'SKIP' or 'RAISE'. See
+        NAU7802.strict."""
+        return self._strict
+
+    @strict.setter
+    def strict(self, mode=None):
+        if mode not in (None, "SKIP", "RAISE"):
+            raise ValueError("Invalid Strict Mode")
+        self._strict = mode
+
+    @property
+    def fresh_samples(self):
+        """Number of samples read from new conversions."""
+        return self._fresh_samples
+
+    @property
+    def stale_samples(self):
+        """Number of samples read without a new conversion."""
+        return self._stale_samples
+
+    @property
+    def missed_conversions(self):
+        """Number of recorded conversions passed over before they were
+        read."""
+        return self._missed_conversions
+
+    def reset_sample_counts(self):
+        """Reset the fresh, stale, and missed sample counters."""
+        self._fresh_samples = 0
+        self._stale_samples = 0
+        self._missed_conversions = 0
+
+    def _wait_fresh(self):
+        """Wait for the next recorded conversion of the selected channel and
+        return its index. Raises EOFError at the end of the capture."""
+        chan = self._channel
+        index = self._next[chan]
+        if index >= len(self._times[chan]):
+            raise EOFError("End of NAU7802 capture")
+        self._advance(int(self._times[chan][index]))
+        index = self._fresh_index()
+        while index is None:  # Rounding of the replay clock
+            time.sleep(0.0001)
+            index = self._fresh_index()
+        return index
+
+    def _consume(self, index):
+        chan = self._channel
+        self._missed_conversions += index - self._next[chan]
+        self._next[chan] = index + 1
+        self._fresh_samples += 1
+        if self._speed is None:
+            self._advance(int(self._times[chan][index]))
+        self._last_raw = int(self._raws[chan][index])
+        return self._last_raw
+
+    def read_raw(self, check_ready=False):
+        """Returns the most recent recorded conversion of the selected channel
+        as a signed 24-bit integer. If check_ready is True, returns None when a
+        new conversion is not yet available. Stale samples are handled
+        according to the strict mode."""
+        index = self._fresh_index()
+        if index is None:
+            if self.finished:
+                raise EOFError("End of NAU7802 capture")
+            if check_ready:
+                return None
+            if self._strict == "RAISE":
+                raise RuntimeError("NAU7802 conversion is stale")
+            if self._strict == "SKIP":
+                index = self._wait_fresh()
+            else:
+                self._stale_samples += 1
+                return self._last_raw
+        return self._consume(index)
+
+    def read(self, check_ready=False):
+        """Returns the recorded conversion value scaled by 2 as a float, as
+        NAU7802.read() does. See read_raw()."""
+        value = self.read_raw(check_ready)
+        if value is None:
+            return None
+        return value * 2.0
+
+    def read_into(self, buf, count=None, channel=None, timeout=None):
+        """Fills buf with consecutive recorded conversion values of the
+        selected channel. When replaying as fast as possible into a buffer
+        object, such as an array('i') or ndarray, the values are copied in one
+        operation; other sequences such as lists are filled one value at a
+        time. Stops early at the end of the capture.
+        Returns a (collected, dropped) tuple. timeout is ignored; recorded
+        conversions always arrive."""
+        if count is None:
+            count = len(buf)
+        if count > len(buf):
+            raise ValueError("Sample count exceeds buffer length")
+        if channel is not None:
+            self.channel = channel
+        missed = self._missed_conversions
+        chan = self._channel
+        if self._speed is None:
+            try:
+                target = np.asarray(memoryview(buf))
+            except TypeError:
+                target = None  # Not a buffer, such as a list
+        else:
+            target = None
+        if target is not None:
+            first = self._next[chan]
+            count = min(count, len(self._times[chan]) - first)
+            if count > 0:
+                target[:count] = self._raws[chan][first : first + count]
+                self._next[chan] = first + count
+                self._fresh_samples += count
+                self._advance(int(self._times[chan][first + count - 1]))
+                self._last_raw = int(self._raws[chan][first + count - 1])
+            return max(count, 0), 0
+        collected = 0
+        while collected < count:
+            try:
+                index = self._wait_fresh()
+            except EOFError:
+                break
+            buf[collected] = self._consume(index)
+            collected += 1
+        return collected, self._missed_conversions - missed
+
+    def stream(self, channels=None, samples_per_switch=10):
+        """A generator that yields (timestamp_ns, channel, raw) tuples in
+        capture time, cycling through the channels tuple as NAU7802.stream()
+        does. Ends at the end of the capture."""
+        if channels is None:
+            channels = (1, 2) if self._act_channels == 2 else (1,)
+        switching = len(channels) > 1
+        if not switching and self._channel != channels[0]:
+            self._select_channel(channels[0])
+        while True:
+            for chan in channels:
+                if switching:
+                    self._select_channel(chan)
+                for _ in range(samples_per_switch):
+                    try:
+                        index = self._wait_fresh()
+                    except EOFError:
+                        return
+                    timestamp_ns = int(self._times[chan][index])
+                    yield (timestamp_ns, chan, self._consume(index))
+
+    def calibrate(self, mode="INTERNAL", timeout=1.0):
+        """Recorded samples are already calibrated; validates mode and returns
+        True."""
+        self.calibrate_start(mode, timeout)
+        return self.calibrate_poll() == "DONE"
+
+    def calibrate_start(self, mode="INTERNAL", timeout=1.0):
+        """Start a calibration. Completes immediately."""
+        if mode not in _CALIBRATION_MODES:
+            raise ValueError("Invalid Calibration Mode")
+        self._calib_mode = mode
+        self._cal_started = time.monotonic()
+        self._cal_ended = None
+
+    def calibrate_poll(self):
+        """Check the progress of a calibration. Always complete."""
+        if self._cal_started is None:
+            return "IDLE"
+        if self._cal_ended is None:
+            self._cal_ended = time.monotonic()
+        return "DONE"
+
+    @property
+    def calibration_state(self):
+        """State of the most recent calibration."""
+        return "IDLE" if self._cal_started is None else "DONE"
+
+    @property
+    def calibration_elapsed(self):
+        """Duration of the most recent calibration in seconds."""
+        if self._cal_started is None:
+            return None
+        return (self._cal_ended or time.monotonic()) - self._cal_started
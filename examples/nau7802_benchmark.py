@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: 2022 Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+nau7802_benchmark.py  Cedar Grove Maker Studios
+
+Benchmarks the NAU7802 driver on Linux against the simulated I2C bus and
+NAU7802 register map in cedargrove_fake_nau7802. For each conversion rate and
+channel mode, reports the achieved samples per second, I2C transactions and
+bytes per sample, channel switch latency, instantiation and calibrate() wall
+time, and heap allocations per sample. The same figures are reported for the
+available() and read() polling loop of the example sketches. The time and bus
+transactions of the gain, ldo_voltage, and conversion_rate setters are
+reported once.
+
+Emits one JSON object per line so that results can be compared between
+revisions:
+
+    PYTHONPATH=code python examples/nau7802_benchmark.py > bench_output.txt
+
+Optional arguments: --duration SECONDS per measurement (default 1.0) and
+--rates to limit the conversion rates, e.g. --rates 80 320.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from array import array
+
+from cedargrove_nau7802 import NAU7802
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+
+RATES = (10, 20, 40, 80, 320)
+
+
+def build(active_channels):
+    """Instantiate a simulated bus and NAU7802; return the bus, the driver,
+    and the instantiation wall time in seconds."""
+    bus = FakeI2C(FakeNAU7802Device(inputs=(150_000, -80_000), noise=20, seed=1))
+    start = time.monotonic()
+    nau7802 = NAU7802(bus, active_channels=active_channels)
+    return bus, nau7802, time.monotonic() - start
+
+
+def per_sample(bus, samples):
+    """Bus traffic per sample since the last counter reset."""
+    samples = max(samples, 1)
+    return {
+        "transactions_per_sample": bus.transactions / samples,
+        "bytes_per_sample": (bus.bytes_read + bus.bytes_written) / samples,
+    }
+
+
+def heap_per_sample(read_sample, samples=100):
+    """Heap allocated per sample while calling read_sample(), which returns
+    one fresh sample."""
+    for _ in range(2):  # Warm up code paths
+        read_sample()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for _ in range(samples):
+        read_sample()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "heap_net_bytes_per_sample": (current - base) / samples,
+        "heap_peak_bytes": peak - base,
+    }
+
+
+def bench_single(rate, duration):
+    """Single channel acquisition with read_into()."""
+    bus, nau7802, init_time = build(active_channels=1)
+    nau7802.conversion_rate = rate
+    count = max(int(rate * duration), 2)
+    buffer = array("i", [0] * count)
+    nau7802.read_raw(check_ready=True)
+    bus.reset_counters()
+    start = time.monotonic()
+    collected, dropped = nau7802.read_into(buffer)
+    elapsed = time.monotonic() - start
+    result = {
+        "mode": "single",
+        "rate": rate,
+        "samples": collected,
+        "dropped": dropped,
+        "samples_per_sec": collected / elapsed,
+        "init_sec": init_time,
+    }
+    result.update(per_sample(bus, collected))
+    start = time.monotonic()
+    result["calibrate_ok"] = nau7802.calibrate("INTERNAL")
+    result["calibrate_sec"] = time.monotonic() - start
+
+    def read_sample():
+        while nau7802.read_raw(check_ready=True) is None:
+            pass
+
+    result.update(heap_per_sample(read_sample, samples=min(count, 100)))
+    return result
+
+
+def bench_available(rate, duration):
+    """Single channel acquisition with an available() and read() loop, as in
+    the example sketches. Polls without pausing between checks."""
+    bus, nau7802, init_time = build(active_channels=1)
+    nau7802.conversion_rate = rate
+    count = max(int(rate * duration), 2)
+    nau7802.read_raw(check_ready=True)
+    bus.reset_counters()
+    start = time.monotonic()
+    samples = 0
+    while samples < count:
+        if nau7802.available():
+            nau7802.read()
+            samples += 1
+    elapsed = time.monotonic() - start
+    result = {
+        "mode": "available",
+        "rate": rate,
+        "samples": samples,
+        "samples_per_sec": samples / elapsed,
+        "init_sec": init_time,
+    }
+    result.update(per_sample(bus, samples))
+
+    def read_sample():
+        while not nau7802.available():
+            pass
+        nau7802.read()
+
+    result.update(heap_per_sample(read_sample, samples=min(count, 100)))
+    return result
+
+
+def bench_dual(rate, duration):
+    """Dual channel acquisition with the channel setter and with stream()."""
+    bus, nau7802, init_time = build(active_channels=2)
+    nau7802.conversion_rate = rate
+    bus.reset_counters()
+    start = time.monotonic()
+    nau7802.channel = 2
+    switch_time = time.monotonic() - start
+    switch_transactions = bus.transactions
+    samples_per_switch = max(int(rate * duration / 4), 1)
+    stream = nau7802.stream(channels=(1, 2), samples_per_switch=samples_per_switch)
+    bus.reset_counters()
+    start = time.monotonic()
+    samples = 0
+    while time.monotonic() - start < duration:
+        next(stream)
+        samples += 1
+    elapsed = time.monotonic() - start
+    result = {
+        "mode": "dual",
+        "rate": rate,
+        "samples": samples,
+        "samples_per_switch": samples_per_switch,
+        "samples_per_sec": samples / elapsed,
+        "switch_sec": switch_time,
+        "switch_transactions": switch_transactions,
+        "init_sec": init_time,
+    }
+    result.update(per_sample(bus, samples))
+    result.update(heap_per_sample(stream.__next__, samples=min(samples, 100)))
+    return result
+
+
+def bench_setters(repeats=100):
+    """Time and bus transactions of each configuration setter, alternating
+    between two values so that every call changes the register."""
+    bus, nau7802, _ = build(active_channels=1)
+    result = {"mode": "setters"}
+    for name, values in (
+        ("gain", (64, 128)),
+        ("ldo_voltage", ("2V7", "3V0")),
+        ("conversion_rate", (80, 10)),
+    ):
+        bus.reset_counters()
+        start = time.monotonic()
+        for i in range(repeats):
+            setattr(nau7802, name, values[i & 1])
+        result[name + "_sec"] = (time.monotonic() - start) / repeats
+        result[name + "_transactions"] = bus.transactions / repeats
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--rates", type=int, nargs="+", default=RATES)
+    args = parser.parse_args()
+    results = [bench_setters()]
+    for rate in args.rates:
+        for bench in (bench_single, bench_available, bench_dual):
+            results.append(bench(rate, args.duration))
+    for result in results:
+        result["python"] = sys.implementation.name
+        print(json.dumps(result, sort_keys=True))
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2022 Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+nau7802_footprint.py  Cedar Grove Maker Studios
+
+Measures the import time and heap usage of the NAU7802 driver module, the
+heap used by one NAU7802 instance, and the gain setter time. Runs on
+CircuitPython with a connected NAU7802 FeatherWing, or on Linux against the
+simulated I2C bus in cedargrove_fake_nau7802:
+
+    PYTHONPATH=code python examples/nau7802_footprint.py
+
+Prints one JSON object. Run it before anything else is imported (e.g. as
+code.py) so that only the driver and its dependencies are measured.
+"""
+
+# pylint: disable=import-outside-toplevel
+import gc
+import json
+import sys
+import time
+
+INSTANCES = 10  # Instances averaged for the per-instance heap usage
+
+try:
+    gc.mem_free()  # CircuitPython and MicroPython heap
+
+    def heap_used():
+        """Bytes allocated on the heap after a collection."""
+        gc.collect()
+        return gc.mem_alloc()
+
+    TRACED = False
+except AttributeError:
+    import tracemalloc
+
+    tracemalloc.start()
+
+    def heap_used():
+        """Bytes allocated by Python after a collection."""
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0]
+
+    TRACED = True
+
+
+def main():
+    result = {"python": sys.implementation.name}
+    before = heap_used()
+    start = time.monotonic_ns()
+    from cedargrove_nau7802 import NAU7802
+
+    result["import_ms"] = (time.monotonic_ns() - start) / 1_000_000
+    result["import_heap_bytes"] = heap_used() - before
+
+    if TRACED:
+        from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+
+        i2c = FakeI2C(FakeNAU7802Device())
+    else:
+        import board
+
+        i2c = board.I2C()
+    nau7802 = NAU7802(i2c, active_channels=2)  # Warm up code paths
+    before = heap_used()
+    instances = [NAU7802(i2c, active_channels=2) for _ in range(INSTANCES)]
+    result["instance_heap_bytes"] = (heap_used() - before) // len(instances)
+    del instances
+
+    before = heap_used()
+    for factor in (1, 2, 4, 8, 16, 32, 64, 128):
+        nau7802.gain = factor
+    for voltage in ("2V4", "2V7", "3V0"):
+        nau7802.ldo_voltage = voltage
+    result["configure_heap_bytes"] = heap_used() - before
+    start = time.monotonic_ns()
+    for _ in range(100):
+        nau7802.gain = 128
+    result["gain_setter_us"] = (time.monotonic_ns() - start) / 100_000
+    print(json.dumps(result))
+
+
+main()
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""Shared fixtures: an NAU7802 driver attached to the simulated device."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "code"))
+
+# pylint: disable=wrong-import-position,too-few-public-methods
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+
+RATE = 320  # Fastest conversion rate keeps the tests short
+
+
+class SimClock:
+    """A nanosecond clock for the simulated device that follows
+    time.monotonic_ns() until frozen. While frozen, time only moves with
+    advance(), so conversions complete exactly when a test says so."""
+
+    def __init__(self):
+        self._offset = 0
+        self._frozen = None
+
+    def __call__(self):
+        if self._frozen is not None:
+            return self._frozen
+        return time.monotonic_ns() + self._offset
+
+    def freeze(self):
+        """Stop the clock."""
+        self._frozen = self()
+
+    def advance(self, seconds):
+        """Move the clock forward."""
+        if self._frozen is not None:
+            self._frozen += int(seconds * 1_000_000_000)
+        else:
+            self._offset += int(seconds * 1_000_000_000)
+
+
+class DRDYValuePin:
+    """A digitalio-style DRDY pin that follows the cycle ready bit."""
+
+    def __init__(self, device):
+        self._device = device
+
+    @property
+    def value(self):
+        """True while a conversion is ready to read."""
+        self._device._update()  # pylint: disable=protected-access
+        return bool(self._device.registers[0x00] & 0x20)
+
+
+class DRDYCounterPin:
+    """A countio-style DRDY pin that counts conversion edges."""
+
+    def __init__(self, device):
+        self._device = device
+
+    @property
+    def count(self):
+        """Conversions completed since the device was created."""
+        self._device._update()  # pylint: disable=protected-access
+        return self._device.conversions
+
+
+@pytest.fixture
+def clock():
+    """The simulated device clock."""
+    return SimClock()
+
+
+@pytest.fixture
+def device(clock):
+    """A noiseless simulated NAU7802 with distinct channel inputs."""
+    return FakeNAU7802Device(inputs=(1000, -2000), clock=clock)
+
+
+@pytest.fixture
+def i2c(device):
+    """A simulated I2C bus with the device at the NAU7802 address."""
+    return FakeI2C(device)
+
+
+@pytest.fixture
+def nau7802(i2c):
+    """A dual channel driver running at the fastest conversion rate."""
+    adc = NAU7802(i2c, active_channels=2)
+    adc.conversion_rate = RATE
+    return adc
@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""Register-level tests of the simulated I2C bus, NAU7802 and multiplexer."""
+
+import itertools
+from array import array
+
+import cedargrove_fake_nau7802 as fake_nau7802
+import pytest
+from cedargrove_fake_nau7802 import (
+    FakeI2C,
+    FakeNAU7802,
+    FakeNAU7802Device,
+    FakeTCA9548A,
+    SignalModel,
+)
+
+ADDRESS = 0x2A
+PERIOD = 3_125_000  # 320 SPS conversion period (ns)
+
+
+def write(i2c, reg, *values):
+    """Write values to consecutive registers starting at reg."""
+    i2c.writeto(ADDRESS, bytes((reg,) + values))
+
+
+def read(i2c, reg, length=1):
+    """Read length consecutive registers starting at reg."""
+    buf = bytearray(length)
+    i2c.writeto_then_readfrom(ADDRESS, bytes((reg,)), buf)
+    return buf
+
+
+def read_adc(i2c):
+    """Read the signed 24-bit conversion result."""
+    value = int.from_bytes(read(i2c, 0x12, 3), "big")
+    return value - 0x1000000 if value & 0x800000 else value
+
+
+@pytest.fixture
+def started(device, i2c, clock):
+    """The device powered up and converting at 320 SPS and gain 128, with
+    the clock frozen at the start of the conversion cycle."""
+    clock.freeze()
+    write(i2c, 0x01, 0x07)  # CTRL1 gain 128
+    write(i2c, 0x02, 0x70)  # CTRL2 320 SPS
+    write(i2c, 0x00, 0x16)  # PU_CTRL PUD, PUA and CS
+    return device
+
+
+def test_bus_counts_transactions_and_bytes(i2c):
+    i2c.reset_counters()
+    write(i2c, 0x01, 0x07)
+    read(i2c, 0x12, 3)
+    assert (i2c.transactions, i2c.writes, i2c.reads) == (2, 1, 1)
+    assert (i2c.bytes_written, i2c.bytes_read) == (3, 3)
+
+
+def test_bus_rejects_missing_device():
+    with pytest.raises(OSError):
+        write(FakeI2C(), 0x00, 0x01)
+
+
+def test_power_up_and_conversion_timing(started, i2c, clock):
+    assert not read(i2c, 0x00)[0] & 0x08  # PUR after the power-up delay
+    clock.advance(0.0002)
+    assert read(i2c, 0x00)[0] & 0x08
+    assert not read(i2c, 0x00)[0] & 0x20  # No conversion before one period
+    clock.advance(PERIOD / 1e9)
+    assert read(i2c, 0x00)[0] & 0x20
+    assert read_adc(i2c) == 1000
+    assert not read(i2c, 0x00)[0] & 0x20  # Reading ADCO_B0 clears CR
+    clock.advance(3 * PERIOD / 1e9)
+    assert read(i2c, 0x00)[0] & 0x20
+    assert started.conversions == 4
+
+
+def test_conversion_scales_with_pga_gain(started, i2c, clock):
+    write(i2c, 0x01, 0x06)  # Gain 64
+    clock.advance(PERIOD / 1e9)
+    assert read_adc(i2c) == 500
+    write(i2c, 0x01, 0x00)  # Gain 1
+    clock.advance(PERIOD / 1e9)
+    assert read_adc(i2c) == 7  # 1000 / 128
+
+
+def test_calibration_registers_apply_per_channel(started, i2c, clock):
+    write(i2c, 0x0A, 0x00, 0x00, 0x64)  # OCAL2 = 100
+    clock.advance(PERIOD / 1e9)
+    assert read_adc(i2c) == 1000  # Channel 1 uses OCAL1
+    write(i2c, 0x02, 0xF0)  # Select channel 2
+    clock.advance(0.1)  # Past the multiplexer settling time
+    assert read_adc(i2c) == -2100
+    write(i2c, 0x0D, 0x01, 0x00, 0x00, 0x00)  # GCAL2 = 2.0
+    clock.advance(PERIOD / 1e9)
+    assert read_adc(i2c) == -4200
+
+
+def test_offset_calibration_updates_selected_channel(started, i2c, clock):
+    write(i2c, 0x02, 0xF6)  # Channel 2, start offset calibration
+    clock.advance(0.1)
+    assert not read(i2c, 0x02)[0] & 0x04  # CALS cleared when done
+    assert read(i2c, 0x0A, 3) == (-2000 & 0xFFFFFF).to_bytes(3, "big")
+    assert read(i2c, 0x03, 3) == bytes(3)
+
+
+def test_callable_input_and_settling(i2c, clock):
+    device = FakeNAU7802Device(inputs=(lambda seconds: 5000, 0), clock=clock)
+    i2c.devices[ADDRESS] = device
+    clock.freeze()
+    write(i2c, 0x01, 0x07)
+    write(i2c, 0x02, 0x70)
+    write(i2c, 0x00, 0x16)
+    clock.advance(PERIOD / 1e9)
+    assert read_adc(i2c) == 5000
+    write(i2c, 0x02, 0xF0)  # Channel 2 settles from 5000 toward 0
+    clock.advance(PERIOD / 1e9)
+    assert 0 < read_adc(i2c) < 5000
+    clock.advance(0.1)
+    assert read_adc(i2c) == 0
+
+
+def test_multiplexer_routes_selected_port(clock):
+    mux = FakeTCA9548A()
+    mux.add_device(0, FakeNAU7802Device(clock=clock))
+    mux.add_device(3, FakeNAU7802Device(clock=clock))
+    i2c = FakeI2C()
+    i2c.devices[0x70] = mux
+    with pytest.raises(OSError):
+        read(i2c, 0x1F)  # No port enabled
+    i2c.writeto(0x70, bytes((1 << 3,)))
+    assert read(i2c, 0x1F)[0] == 0x0F
+    assert mux.selected == 0x08
+    i2c.writeto(0x70, bytes((0x09,)))
+    with pytest.raises(OSError):
+        read(i2c, 0x1F)  # Address conflict
+    assert mux.selects == 2
+
+
+def models(seed=11):
+    """Seeded signal models with noise, a load step and drift."""
+    return (
+        SignalModel(1000, steps=((0.5, 20_000),), noise=30, drift=50, seed=seed),
+        SignalModel(-4000, noise=30, seed=seed + 1),
+    )
+
+
+def fake(seed=11):
+    """A dual channel high level fake at 80 SPS."""
+    nau7802 = FakeNAU7802(None, active_channels=2, models=models(seed))
+    nau7802.conversion_rate = 80
+    return nau7802
+
+
+def test_signal_model_sample_and_generate_agree():
+    for gain, rate in ((128, 10), (32, 320)):
+        by_sample, bulk = models()[0], models()[0]
+        expected = [by_sample.sample(i / rate, gain, rate) for i in range(200)]
+        # Equal noise; NumPy and math exp() may differ in the last bit
+        assert list(bulk.generate(0, 200, gain, rate)) == pytest.approx(expected)
+    assert models()[0](10) == pytest.approx(21_000.826, abs=0.001)  # Noiseless
+
+
+def test_signal_model_without_numpy_matches(monkeypatch):
+    expected = list(models()[0].generate(0.25, 100, rate=80))
+    monkeypatch.setattr(fake_nau7802, "np", None)
+    assert models()[0].generate(0.25, 100, rate=80) == pytest.approx(expected)
+
+
+def test_read_into_list_and_array_agree():
+    values = [0] * 120
+    assert fake().read_into(values, channel=1) == (120, 0)
+    buf = array("i", [0] * 120)
+    assert fake().read_into(buf, channel=1) == (120, 0)
+    assert list(buf) == values
+    assert list(fake(seed=12).generate(120)) != values
+
+
+def test_stream_timestamps_follow_simulated_time():
+    nau7802 = fake()
+    samples = list(itertools.islice(nau7802.stream(samples_per_switch=4), 16))
+    assert [s[1] for s in samples] == [1] * 4 + [2] * 4 + [1] * 4 + [2] * 4
+    steps = {b[0] - a[0] for a, b in zip(samples, samples[1:]) if a[1] == b[1]}
+    assert steps == {12_500_000}  # One 80 SPS period
+    settling = samples[4][0] - samples[3][0]
+    assert settling == 12_500_000 * (1 + nau7802.settling_conversions)
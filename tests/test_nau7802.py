@@ -0,0 +1,314 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""NAU7802 driver tests against the simulated I2C bus and device."""
+
+import time
+from array import array
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802, ConversionRate, Gain, LDOVoltage
+from conftest import RATE, DRDYCounterPin, DRDYValuePin
+
+PERIOD = 1 / RATE
+
+
+def read_fresh(nau7802):
+    """Read the next fresh conversion."""
+    nau7802.strict = "SKIP"
+    try:
+        return nau7802.read_raw()
+    finally:
+        nau7802.strict = None
+
+
+def read_frozen(nau7802, clock):
+    """Stop the device clock, then read the one conversion completed by
+    advancing it a period."""
+    clock.freeze()
+    clock.advance(PERIOD)
+    return read_fresh(nau7802)
+
+
+def test_read_is_one_result_burst(nau7802, i2c, clock):
+    read_frozen(nau7802, clock)
+    i2c.reset_counters()
+    assert nau7802.read() == 2000.0
+    assert (i2c.transactions, i2c.bytes_written, i2c.bytes_read) == (1, 1, 3)
+
+
+def test_status_burst_reads_status_and_result_together(nau7802, i2c, clock):
+    nau7802.status_burst = True
+    read_frozen(nau7802, clock)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) is None
+    assert (i2c.transactions, i2c.bytes_read) == (1, 21)
+
+    clock.advance(PERIOD)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) == 1000
+    assert (i2c.transactions, i2c.bytes_read) == (1, 21)
+    assert nau7802.gain == 128  # Register fields still use the larger buffer
+
+    nau7802.status_burst = False
+    clock.advance(PERIOD)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) == 1000
+    assert (i2c.transactions, i2c.bytes_read) == (2, 4)
+
+
+def test_check_ready_polls_one_status_byte(nau7802, i2c, clock):
+    read_frozen(nau7802, clock)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) is None
+    assert (i2c.transactions, i2c.bytes_read) == (1, 1)
+
+    clock.advance(PERIOD)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) == 1000
+    assert (i2c.transactions, i2c.bytes_read) == (2, 4)
+
+
+def test_read_into_fills_array_with_paced_polling(nau7802, i2c):
+    buf = array("i", [0] * 16)
+    read_fresh(nau7802)
+    i2c.reset_counters()
+    # Missed conversions are not checked: at 320 SPS, 1 ms tick rounding
+    # occasionally counts one
+    assert nau7802.read_into(buf, count=12)[0] == 12
+    assert list(buf) == [1000] * 12 + [0] * 4
+    assert i2c.transactions < 10 * 12  # Paced, not a busy loop
+    with pytest.raises(ValueError):
+        nau7802.read_into(buf, count=17)
+
+
+def test_read_into_stops_at_timeout(nau7802):
+    buf = array("i", [0] * 4)
+    nau7802.enable(False)
+    nau7802.read_raw()  # Clear the cycle ready bit of the last conversion
+    assert nau7802.read_into(buf, timeout=0.02) == (0, 0)
+
+
+def test_reset_and_enable_poll_power_up(i2c):
+    start = time.monotonic()
+    nau7802 = NAU7802(i2c)
+    assert time.monotonic() - start < 0.2  # No fixed 600 ms startup delay
+    assert nau7802.reset()
+    assert nau7802.enable(True)
+
+
+def test_warm_attach_adopts_running_configuration(nau7802, i2c, device):
+    nau7802.gain = 64
+    nau7802.ldo_voltage = "2V7"
+    nau7802.calibration_registers = (-5, 0x800000)
+    warm = NAU7802(i2c, warm=True)
+    assert (warm.gain, warm.ldo_voltage, warm.conversion_rate) == (64, "2V7", RATE)
+    assert warm.calibration_registers == (-5, 0x800000)  # Not reset
+    assert device.registers[0x00] & 0x10  # Cycle start still set
+
+
+def test_warm_attach_starts_stopped_conversions(nau7802, device, i2c):
+    device.registers[0x00] &= ~0x10  # Clear CS; PUR, PUA and PUD stay set
+    warm = NAU7802(i2c, warm=True)
+    assert device.registers[0x00] & 0x10
+    assert read_fresh(warm) == 1000
+
+
+def test_warm_attach_resets_unpowered_device(i2c, device):
+    NAU7802(i2c, warm=True)
+    assert device.registers[0x00] & 0x1E == 0x1E  # PUD, PUA, PUR and CS
+    assert (device.registers[0x02] >> 4) & 0x07 == ConversionRate.RATE_10SPS
+
+
+def test_batched_configuration_writes_each_register_once(nau7802, i2c, device):
+    i2c.reset_counters()
+    with nau7802:
+        nau7802.gain = 64
+        nau7802.ldo_voltage = "2V7"
+        nau7802.conversion_rate = 80
+        assert i2c.writes == 0
+    assert i2c.writes == 2  # CTRL1 and CTRL2
+    assert device.registers[0x01] & 0x3F == (LDOVoltage.LDO_2V7 << 3) | Gain.GAIN_X64
+    assert (device.registers[0x02] >> 4) & 0x07 == ConversionRate.RATE_80SPS
+
+    i2c.reset_counters()
+    nau7802.gain = 128
+    nau7802.ldo_voltage = "3V0"
+    assert i2c.writes == 2  # Unbatched: one write per change
+
+
+def test_shadowed_fields_read_without_bus_traffic(nau7802, i2c):
+    i2c.reset_counters()
+    assert (nau7802.gain, nau7802.channel) == (128, 1)
+    assert i2c.transactions == 0
+
+
+def test_drdy_value_pin_skips_status_reads(device, i2c, clock):
+    nau7802 = NAU7802(i2c, drdy=DRDYValuePin(device))
+    nau7802.conversion_rate = RATE
+    read_frozen(nau7802, clock)
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) is None
+    assert i2c.transactions == 0
+
+    clock.advance(PERIOD)
+    assert nau7802.read_raw(check_ready=True) == 1000
+    assert (i2c.transactions, i2c.bytes_read) == (1, 3)
+
+
+def test_drdy_counter_pin_counts_missed_conversions(device, i2c, clock):
+    nau7802 = NAU7802(i2c, drdy=DRDYCounterPin(device))
+    nau7802.conversion_rate = RATE
+    read_fresh(nau7802)
+    nau7802.reset_sample_counts()
+    read_fresh(nau7802)
+    time.sleep(5 * PERIOD)
+    clock.freeze()
+    i2c.reset_counters()
+    assert nau7802.read_raw(check_ready=True) == 1000
+    assert i2c.transactions == 1
+    assert nau7802.fresh_samples == 2
+    assert nau7802.missed_conversions >= 2
+    assert nau7802.read_raw(check_ready=True) is None
+
+
+def test_available_then_read_is_one_transaction(nau7802, i2c, clock):
+    read_frozen(nau7802, clock)
+    assert not nau7802.available()
+    clock.advance(PERIOD)
+    assert nau7802.available()
+    i2c.reset_counters()
+    assert nau7802.read_raw() == 1000
+    assert (i2c.transactions, i2c.bytes_read) == (1, 3)
+    assert nau7802.fresh_samples == 2
+
+
+def test_strict_none_counts_stale_samples(nau7802, clock):
+    read_frozen(nau7802, clock)
+    nau7802.reset_sample_counts()
+    assert nau7802.read_raw() == 1000
+    assert (nau7802.fresh_samples, nau7802.stale_samples) == (0, 1)
+
+
+def test_strict_skip_waits_for_fresh_sample(nau7802):
+    read_fresh(nau7802)
+    nau7802.reset_sample_counts()
+    nau7802.strict = "SKIP"
+    assert nau7802.read_raw() == 1000
+    assert (nau7802.fresh_samples, nau7802.stale_samples) == (1, 0)
+
+
+def test_strict_raise_rejects_stale_sample(nau7802, clock):
+    read_frozen(nau7802, clock)
+    nau7802.strict = "RAISE"
+    with pytest.raises(RuntimeError):
+        nau7802.read_raw()
+    clock.advance(PERIOD)
+    assert nau7802.read_raw() == 1000
+
+
+def test_strict_mode_is_validated(nau7802):
+    with pytest.raises(ValueError):
+        nau7802.strict = "IGNORE"
+
+
+def test_calibration_uses_each_channel_register_set(nau7802, device):
+    nau7802.channel = 1
+    assert read_fresh(nau7802) == 1000
+    nau7802.channel = 2
+    assert nau7802.calibrate("OFFSET")
+    assert abs(read_fresh(nau7802)) <= 1
+    assert device.registers[0x03:0x06] == bytes(3)  # OCAL1 untouched
+    nau7802.channel = 1
+    assert abs(read_fresh(nau7802) - 1000) <= 1
+    assert nau7802.calibration_registers == (0, 0x800000)
+    assert nau7802.calibration_profiles == {2: (-2000, 0x800000)}
+
+
+def test_calibration_profiles_restore_after_restart(nau7802):
+    nau7802.channel = 2
+    assert nau7802.calibrate("OFFSET")
+    profiles = nau7802.calibration_profiles
+
+    device = FakeNAU7802Device(inputs=(1000, -2000))
+    restarted = NAU7802(FakeI2C(device), active_channels=2)
+    restarted.conversion_rate = RATE
+    restarted.calibration_profiles = profiles
+    assert device.registers[0x0A:0x0D] == (-2000 & 0xFFFFFF).to_bytes(3, "big")
+    restarted.channel = 2
+    assert abs(read_fresh(restarted)) <= 1
+    restarted.channel = 1
+    assert abs(read_fresh(restarted) - 1000) <= 1
+
+
+def test_calibration_start_and_poll(nau7802):
+    assert nau7802.calibration_state == "IDLE"
+    assert nau7802.calibration_elapsed is None
+    nau7802.calibrate_start("INTERNAL")
+    assert nau7802.calibrate_poll() == "RUNNING"
+    while nau7802.calibrate_poll() == "RUNNING":
+        time.sleep(0.001)
+    assert nau7802.calibration_state == "DONE"
+    elapsed = nau7802.calibration_elapsed
+    assert 0 <= elapsed < 0.5
+    time.sleep(0.005)
+    assert nau7802.calibration_elapsed == elapsed  # Fixed once completed
+    with pytest.raises(ValueError):
+        nau7802.calibrate_start("EXTERNAL")
+
+
+def test_calibration_timeout(nau7802, device):
+    device.calibration_conversions = 1_000_000
+    with pytest.raises(RuntimeError):
+        nau7802.calibrate("OFFSET", timeout=0.05)
+    assert nau7802.calibration_state == "TIMEOUT"
+    assert nau7802.calibration_elapsed >= 0.05
+
+
+def test_stats_disabled_by_default(nau7802):
+    assert not nau7802.stats_enabled
+    assert nau7802.stats is None
+    device = nau7802.i2c_device
+    nau7802.stats_enabled = True
+    assert nau7802.i2c_device is not device
+    nau7802.stats_enabled = False
+    assert nau7802.i2c_device is device
+    assert not set(vars(nau7802)) & {"read_raw", "available", "calibrate"}
+
+
+def test_stats_count_bus_traffic_and_polls(nau7802, clock):
+    read_frozen(nau7802, clock)
+    nau7802.stats_enabled = True
+    stats = nau7802.stats
+    assert nau7802.read_raw(check_ready=True) is None
+    clock.advance(PERIOD)
+    assert nau7802.read_raw(check_ready=True) == 1000
+    nau7802.gain = 64
+    assert (stats.bus_reads, stats.bus_writes) == (3, 1)
+    assert (stats.bytes_read, stats.bytes_written) == (5, 5)
+    assert (stats.polls, stats.samples, stats.stale_samples) == (2, 1, 0)
+    stats.reset()
+    assert (stats.bus_reads, stats.polls, stats.samples) == (0, 0, 0)
+
+
+def test_stats_separate_settling_sleeps_from_poll_waits(nau7802):
+    nau7802.stats_enabled = True
+    stats = nau7802.stats
+    nau7802.read_into(array("i", [0] * 4))
+    assert stats.sleep_time == 0
+    assert stats.poll_wait_time > 0
+    nau7802.channel = 2
+    assert stats.sleep_time >= nau7802.settling_time
+
+
+def test_stats_hook_reports_calls(nau7802):
+    calls = []
+    nau7802.stats_enabled = True
+    nau7802.stats.hook = lambda name, elapsed_ns: calls.append((name, elapsed_ns))
+    nau7802.available()
+    nau7802.read()
+    nau7802.channel = 2
+    assert [name for name, _ in calls] == ["available", "read_raw", "read", "channel"]
+    assert all(elapsed >= 0 for _, elapsed in calls)
+    assert calls[-1][1] >= nau7802.settling_time * 1e9
@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""AsyncNAU7802 tests against the simulated I2C bus and device."""
+
+import asyncio
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+from cedargrove_nau7802_async import AsyncNAU7802
+from conftest import RATE
+
+
+@pytest.fixture
+def adc(nau7802):
+    """The dual channel driver wrapped for asyncio."""
+    return AsyncNAU7802(nau7802)
+
+
+def test_read_waits_for_conversion(adc):
+    async def main():
+        return [await adc.read_raw(), await adc.read()]
+
+    assert asyncio.run(main()) == [1000, 2000.0]
+    assert adc.nau7802.fresh_samples == 2
+
+
+def test_set_channel_settles_before_reading(adc):
+    async def main():
+        await adc.set_channel(2)
+        return await adc.read_raw()
+
+    assert abs(asyncio.run(main()) + 2000) <= 1  # Settled within a count
+    assert adc.nau7802.channel == 2
+
+
+def test_calibrate(adc, device):
+    async def main():
+        await adc.set_channel(2)
+        return await adc.calibrate("OFFSET")
+
+    assert asyncio.run(main())
+    assert abs(asyncio.run(adc.read_raw())) <= 1
+
+    device.calibration_conversions = 1_000_000
+    with pytest.raises(RuntimeError):
+        asyncio.run(adc.calibrate("OFFSET", timeout=0.05))
+
+
+def test_devices_read_concurrently():
+    adcs = []
+    for level in (100, 200, 300):
+        nau7802 = NAU7802(FakeI2C(FakeNAU7802Device(inputs=(level, 0))))
+        nau7802.conversion_rate = RATE
+        adcs.append(AsyncNAU7802(nau7802))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        values = await asyncio.gather(*(adc.read_raw() for adc in adcs))
+        task.cancel()
+        return values
+
+    assert asyncio.run(main()) == [100, 200, 300]
+    assert ticks > 1  # Other tasks ran while waiting for data-ready
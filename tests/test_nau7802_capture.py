@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""Capture format round trip tests."""
+
+import itertools
+
+import numpy as np
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+from cedargrove_nau7802_capture import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    CaptureReader,
+    CaptureWriter,
+)
+from conftest import RATE
+
+SAMPLES = 24
+START_NS = 5_000_000_123
+
+
+def write_capture(path, samples, **kwargs):
+    """Write (timestamp_ns, channel, raw) samples to a capture file."""
+    with open(path, "wb") as file:
+        with CaptureWriter(file, **kwargs) as writer:
+            for sample in samples:
+                writer.write(*sample)
+    return path
+
+
+def test_reader_columns(tmp_path):
+    device = FakeNAU7802Device(inputs=(1000, -2000), noise=50, seed=7)
+    nau7802 = NAU7802(FakeI2C(device), active_channels=2)
+    nau7802.conversion_rate = RATE
+    samples = list(itertools.islice(nau7802.stream(samples_per_switch=6), SAMPLES))
+    path = write_capture(tmp_path / "c.bin", samples, rate=RATE, block_records=5)
+    reader = CaptureReader(path)
+    assert len(reader) == SAMPLES
+    assert (reader.rate, reader.active_channels) == (RATE, 2)
+    assert list(reader.channel) == [s[1] for s in samples]
+    assert list(reader.raw) == [s[2] for s in samples]
+    error = reader.timestamp_ns - np.array([s[0] for s in samples])
+    assert np.all(np.abs(error) < 1000)  # Microsecond resolution
+
+
+def test_header_and_mass(tmp_path):
+    samples = [(START_NS, 1, 1100), (START_NS + 1000, 2, -0x800000)]
+    path = write_capture(
+        tmp_path / "c.bin",
+        samples,
+        gain=64,
+        rate=80,
+        zero_offsets=(100, -5),
+        ratios=(0.5, 2.0),
+        start_ns=START_NS - 500,
+    )
+    assert path.stat().st_size == HEADER_SIZE + 2 * RECORD_SIZE
+    reader = CaptureReader(path)
+    assert (reader.gain, reader.rate, reader.start_ns) == (64, 80, START_NS - 500)
+    assert (reader.zero_offsets, reader.ratios) == ((100, -5), (0.5, 2.0))
+    assert list(reader.raw) == [1100, -0x800000]
+    assert list(reader.mass(1)) == [500.0]
+
+
+def test_timestamps_stay_exact_over_long_captures(tmp_path):
+    # 3333 ns steps carry a sub-microsecond remainder between records
+    samples = [(START_NS + i * 3333, 1, i) for i in range(1000)]
+    samples.append((START_NS + 4000 * 1_000_000_000, 1, 0))  # 66 minute gap
+    reader = CaptureReader(write_capture(tmp_path / "c.bin", samples))
+    error = reader.timestamp_ns - np.array([s[0] for s in samples])
+    assert np.all((error <= 0) & (error > -1000))
+
+
+@pytest.mark.parametrize("offset_ns", [5000 * 1_000_000_000, -2000])
+def test_write_rejects_gaps_and_backward_steps(tmp_path, offset_ns):
+    path = tmp_path / "c.bin"
+    with open(path, "wb") as file:
+        with CaptureWriter(file) as writer:
+            writer.write(START_NS, 1, 10)
+            with pytest.raises(ValueError):
+                writer.write(START_NS + offset_ns, 1, 20)
+            writer.write(START_NS + 1000, 1, 30)  # Still usable
+    reader = CaptureReader(path)
+    assert list(reader.raw) == [10, 30]
+    assert list(reader.timestamp_ns) == [START_NS, START_NS + 1000]
+
+
+def test_reader_rejects_other_files_and_ignores_partial_records(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"NOPE" + bytes(HEADER_SIZE))
+    with pytest.raises(ValueError):
+        CaptureReader(path)
+    path = write_capture(tmp_path / "c.bin", [(START_NS, 1, 7)])
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+    assert list(CaptureReader(path).raw) == [7]
+    path = tmp_path / "empty.bin"
+    with open(path, "wb") as file:
+        CaptureWriter(file, start_ns=START_NS).flush()
+    assert len(CaptureReader(path)) == 0
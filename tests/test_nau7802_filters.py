@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""Streaming filter tests."""
+
+import random
+import statistics
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+from cedargrove_nau7802_filters import (
+    ExponentialSmoothing,
+    Kalman1D,
+    MovingAverage,
+    MovingMedian,
+    StabilityDetector,
+    measure,
+)
+from conftest import RATE
+
+
+def samples(count=200, seed=3):
+    """Noisy raw ADC values around 100000."""
+    rng = random.Random(seed)
+    return [100_000 + rng.randint(-500, 500) for _ in range(count)]
+
+
+@pytest.mark.parametrize("typecode", ["f", "d", "i"])
+def test_moving_average_matches_window_mean(typecode):
+    size = 10
+    smooth = MovingAverage(size, typecode)
+    assert smooth.value is None
+    values = samples()
+    for i, sample in enumerate(values):
+        value = smooth.update(sample)
+        window = values[max(0, i + 1 - size) : i + 1]
+        assert value == pytest.approx(statistics.mean(window), abs=1e-6)
+    assert smooth.count == size
+
+
+def test_moving_average_accepts_floats_and_large_values():
+    smooth = MovingAverage(4)
+    assert smooth.update(2000.5) == 2000.5  # NAU7802.read() values
+    assert smooth.update(-0x7FFFFF * 2.0) == pytest.approx((2000.5 - 0xFFFFFE) / 2)
+    smooth = MovingAverage(2, typecode="d")
+    assert smooth.update(2**40) == 2**40
+    with pytest.raises(TypeError):
+        MovingAverage(2, typecode="i").update(1.5)
+
+
+def test_filters_validate_arguments():
+    for factory in (MovingAverage, MovingMedian):
+        with pytest.raises(ValueError):
+            factory(0)
+        with pytest.raises(ValueError):
+            factory(4, typecode="h")
+    with pytest.raises(ValueError):
+        ExponentialSmoothing(0)
+    with pytest.raises(ValueError):
+        Kalman1D(measurement_variance=0)
+
+
+@pytest.mark.parametrize("size", [1, 4, 7])
+def test_moving_median_matches_window_median(size):
+    median = MovingMedian(size)
+    values = samples()
+    for i, sample in enumerate(values):
+        window = values[max(0, i + 1 - size) : i + 1]
+        assert median.update(sample) == statistics.median(window)
+
+
+def test_moving_median_rejects_outliers():
+    median = MovingMedian(5)
+    for sample in (10.5, 11.5, 1e6, 10.5, 12.5):
+        value = median.update(sample)
+    assert value == 11.5
+
+
+def test_reset_clears_history():
+    for filt in (MovingAverage(3), MovingMedian(3)):
+        filt.update(100)
+        filt.reset()
+        assert (filt.value, filt.count) == (None, 0)
+        assert filt.update(5) == 5
+    for filt in (ExponentialSmoothing(), Kalman1D()):
+        filt.update(100)
+        filt.reset()
+        assert filt.value is None
+        assert filt.update(5) == 5.0
+
+
+def test_exponential_smoothing():
+    ema = ExponentialSmoothing(alpha=0.5)
+    assert ema.value is None
+    assert ema.update(100) == 100.0
+    assert ema.update(200) == 150.0
+    assert ema.update(200) == 175.0
+    assert ExponentialSmoothing(alpha=1).update(7) == 7.0
+
+
+def test_kalman_converges_and_reduces_variance():
+    kalman = Kalman1D(process_variance=0.01, measurement_variance=500**2 / 3)
+    for sample in samples(2000):
+        kalman.update(sample)
+    assert kalman.value == pytest.approx(100_000, abs=50)
+    assert kalman.variance < 500**2 / 3 / 100
+
+
+def test_kalman_tracks_a_step():
+    kalman = Kalman1D(process_variance=100.0, measurement_variance=100.0)
+    kalman.update(0)
+    for _ in range(50):
+        value = kalman.update(1000)
+    assert value == pytest.approx(1000, abs=1)
+
+
+def test_stability_detector_waits_for_a_full_settled_window():
+    detector = StabilityDetector(tolerance=5, window=8)
+    assert detector.mean is None
+    for _ in range(7):
+        assert not detector.update(1000)
+    assert detector.update(1000)
+    assert detector.mean == 1000
+    assert not detector.update(1100)  # Step in the newer half
+    for _ in range(8):
+        stable = detector.update(1100)
+    assert stable
+    assert detector.mean == 1100
+
+
+def test_stability_detector_rejects_noise_and_drift():
+    noisy = StabilityDetector(tolerance=5, window=16)
+    for sample in samples(16):
+        stable = noisy.update(sample)
+    assert not stable
+    drifting = StabilityDetector(tolerance=5, window=16)
+    for i in range(16):
+        stable = drifting.update(1000 + 2 * i)
+    assert not stable
+    with pytest.raises(ValueError):
+        StabilityDetector(tolerance=5, window=1)
+
+
+def test_measure_stops_once_stable():
+    device = FakeNAU7802Device(inputs=(1000, 0), noise=20, seed=5)
+    nau7802 = NAU7802(FakeI2C(device))
+    nau7802.conversion_rate = RATE
+    value, count, stable = measure(nau7802, tolerance=10, window=16)
+    assert stable
+    assert value == pytest.approx(1000, abs=20)
+    assert 16 <= count < 100
+
+
+def test_measure_times_out_without_conversions(nau7802):
+    nau7802.enable(False)
+    nau7802.read_raw()  # Clear the cycle ready bit of the last conversion
+    assert measure(nau7802, timeout=0.02) == (None, 0, False)
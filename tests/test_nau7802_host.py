@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""SampleRing and AcquisitionService tests."""
+
+import time
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+from cedargrove_nau7802_host import AcquisitionService, SampleRing
+from conftest import RATE
+
+
+class RacingRing(SampleRing):
+    """A ring whose writer appends racing samples right after the reader
+    reads the written sample count."""
+
+    racing = 0
+
+    @property
+    def count(self):
+        count = int(self._header[0])
+        for _ in range(self.racing):
+            self.write(self._header[0], 1, self._header[0])
+        self.racing = 0
+        return count
+
+
+@pytest.fixture
+def ring():
+    """A ring of four records; closed after the test."""
+    ring = SampleRing(4)
+    yield ring
+    ring.close()
+
+
+def fill(ring, stop, start=0):
+    """Write samples start to stop - 1; raw and timestamp equal the index."""
+    for i in range(start, stop):
+        ring.write(i, 1 + i % 2, i)
+
+
+def test_read_views_in_time_order(ring):
+    fill(ring, 3)
+    views, cursor, lost = ring.read()
+    assert ([list(v["raw"]) for v in views], cursor, lost) == ([[0, 1, 2]], 3, 0)
+    assert ring.read(cursor) == ([], 3, 0)
+    fill(ring, 5, start=3)
+    views, cursor, lost = ring.read(cursor)
+    assert ([list(v["raw"]) for v in views], cursor, lost) == ([[3], [4]], 5, 0)
+    assert list(views[0]["channel"]) == [2]
+
+
+def test_read_counts_overwritten_samples(ring):
+    fill(ring, 10)
+    views, cursor, lost = ring.read(0)
+    assert [list(v["raw"]) for v in views] == [[6, 7], [8, 9]]
+    assert (cursor, lost) == (10, 6)
+    fill(ring, 12, start=10)
+    views, cursor, lost = ring.read(8)
+    assert ([list(v["raw"]) for v in views], cursor, lost) == ([[8, 9, 10, 11]], 12, 0)
+
+
+def test_read_copy_leaves_the_slot_being_written(ring):
+    fill(ring, 10)
+    samples, cursor, lost = ring.read_copy(0)
+    assert (list(samples["raw"]), cursor, lost) == ([7, 8, 9], 10, 7)
+    fill(ring, 12, start=10)
+    samples, cursor, lost = ring.read_copy(cursor)
+    assert (list(samples["raw"]), cursor, lost) == ([10, 11], 12, 0)
+    samples, cursor, lost = ring.read_copy(cursor)
+    assert (len(samples), cursor, lost) == (0, 12, 0)
+
+
+def test_read_copy_drops_records_overwritten_during_copy():
+    ring = RacingRing(4)
+    try:
+        fill(ring, 3)
+        ring.racing = 2
+        samples, cursor, lost = ring.read_copy(0)
+        # Records 0 and 1 share slots with record 4, written during the
+        # copy, and record 5, written next
+        assert (list(samples["raw"]), cursor, lost) == ([2], 3, 2)
+    finally:
+        ring.close()
+
+
+def test_latest(ring):
+    assert len(ring.latest(3)) == 0
+    fill(ring, 6)
+    assert list(ring.latest(2)["raw"]) == [4, 5]
+    assert list(ring.latest(10)["raw"]) == [3, 4, 5]  # capacity - 1
+
+
+def test_attach_by_name(ring):
+    other = SampleRing(name=ring.name)
+    try:
+        fill(ring, 2)
+        assert (other.capacity, other.count) == (4, 2)
+        assert list(other.read_copy()[0]["raw"]) == [0, 1]
+    finally:
+        other.close()
+    with pytest.raises(ValueError):
+        SampleRing(0)
+
+
+def simulated_nau7802():
+    """Factory run in the worker process."""
+    nau7802 = NAU7802(FakeI2C(FakeNAU7802Device(inputs=(1000, -2000))))
+    nau7802.conversion_rate = RATE
+    return nau7802
+
+
+def test_acquisition_service_fills_rings():
+    with AcquisitionService((simulated_nau7802,), capacity=256) as service:
+        ring = service.rings[0]
+        deadline = time.monotonic() + 20
+        while ring.count < 20 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert service.running
+        samples, _, lost = ring.read_copy()
+    assert len(samples) >= 19
+    assert lost == 0
+    assert set(samples["raw"]) == {1000}
+    assert all(samples["timestamp_ns"][1:] > samples["timestamp_ns"][:-1])
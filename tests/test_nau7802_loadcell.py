@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""LoadCell tests against the simulated I2C bus and device."""
+
+import pytest
+from cedargrove_nau7802_loadcell import LoadCell
+
+RAW_EXTREMES = (-0x800000, -0x7FFFFF, -1, 0, 1, 0xFFF, 0x1000, 0x7FFFFF)
+
+
+@pytest.mark.parametrize("ratio", [2.4e-3, 0.1, 1.0, 3.75, -0.05, 1e-7])
+@pytest.mark.parametrize("zero", [-0x800000, -1234, 0, 0x7FFFFF])
+def test_milliunits_matches_single_product(ratio, zero):
+    scale = LoadCell(None, ratio=ratio, zero_offset=zero)
+    # pylint: disable=protected-access
+    multiplier, shift = scale._multiplier, scale._shift
+    assert abs(multiplier) <= 1 << 15
+    for raw in RAW_EXTREMES:
+        delta = raw - zero
+        exact = (delta * multiplier + ((1 << shift) >> 1)) >> shift
+        assert scale.milliunits(raw) == exact
+        ideal = delta * ratio * 1000
+        assert abs(scale.milliunits(raw) - ideal) <= 1 + abs(ideal) / (1 << 14)
+
+
+def test_mass_units_and_rounding():
+    scale = LoadCell(None, ratio=0.01, zero_offset=100)
+    assert scale.milliunits(100) == 0
+    assert scale.milliunits(150) == 500
+    assert scale.mass(1100) == 10.0
+    assert scale.mass(-900) == -10.0
+    scale.units = "oz"
+    assert scale.mass(100 + 2835) == pytest.approx(1, abs=0.001)
+    scale = LoadCell(None, ratio=0.5)
+    assert [scale.milliunits(raw) for raw in (0, 1, -1)] == [0, 500, -500]
+    scale = LoadCell(None, ratio=0.0015)
+    assert [scale.milliunits(raw) for raw in (1, -1)] == [2, -1]  # Half up
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        LoadCell(None, ratio=0)
+    with pytest.raises(ValueError):
+        LoadCell(None, units="lb")
+    scale = LoadCell(None)
+    with pytest.raises(ValueError):
+        scale.calibrate_points(500, 0, 500, 100)
+
+
+def test_zero_reads_channel_average(nau7802):
+    scale = LoadCell(nau7802, channel=2)
+    assert scale.zero(samples=8, calibrate=False) == -2000
+    assert nau7802.channel == 2
+    assert scale.read() == 0.0
+
+
+def test_zero_calibrates_offset(nau7802):
+    scale = LoadCell(nau7802, channel=2)
+    assert abs(scale.zero(samples=8)) <= 1
+    assert nau7802.calibration_state == "DONE"
+    assert nau7802.calibration_profiles[2][0] == -2000
+
+
+def test_zero_raises_on_calibration_failure(nau7802, monkeypatch):
+    monkeypatch.setattr(nau7802, "calibrate", lambda mode: False)
+    with pytest.raises(RuntimeError):
+        LoadCell(nau7802).zero(samples=8)
+
+
+def test_calibrate_with_known_mass(nau7802, device):
+    scale = LoadCell(nau7802)
+    scale.zero(samples=8, calibrate=False)
+    device.inputs[0] = 1000 + 40_000  # 100 grams placed
+    assert scale.calibrate(100, samples=8) == pytest.approx(100 / 40_000)
+    assert scale.read(samples=4) == pytest.approx(100, abs=0.001)
+    device.inputs[0] = 1000 + 10_000
+    assert scale.read(samples=4) == pytest.approx(25, abs=0.001)
+
+
+def test_calibrate_points_sets_ratio_and_zero():
+    scale = LoadCell(None)
+    scale.calibrate_points(11_000, 50, 21_000, 150)
+    assert scale.ratio == 0.01
+    assert scale.zero_offset == 6000
+    assert scale.mass(6000) == 0.0
+    assert scale.mass(31_000) == 250.0
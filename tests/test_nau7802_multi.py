@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""NAU7802Manager tests against a simulated multiplexer."""
+
+import itertools
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device, FakeTCA9548A
+from cedargrove_nau7802_multi import NAU7802Manager
+from conftest import RATE
+
+PORTS = (0, 1, 2)
+
+
+@pytest.fixture
+def mux():
+    """A multiplexer with a device on each port; port n reads 1000 * n."""
+    mux = FakeTCA9548A()
+    for port in PORTS:
+        mux.add_device(port, FakeNAU7802Device(inputs=(1000 * port, 0)))
+    return mux
+
+
+@pytest.fixture
+def manager(mux):
+    """A manager of the devices on the simulated multiplexer."""
+    i2c = FakeI2C()
+    i2c.devices[0x70] = mux
+    adcs = NAU7802Manager(i2c, ports=PORTS)
+    for adc in adcs:
+        adc.conversion_rate = RATE
+    return adcs
+
+
+def test_devices_share_the_address(mux, manager):
+    assert len(manager) == len(PORTS)
+    assert manager.selects == mux.selects
+    assert manager[1].channel == 1
+
+
+def test_read_all(manager):
+    assert manager.read_all() == [0, 1000, 2000]
+
+
+def test_stream_reads_every_port_without_cycling(mux, manager):
+    manager.read_all()
+    selects = manager.selects
+    samples = list(itertools.islice(manager.stream(), 30))
+    for _, port, channel, raw in samples:
+        assert channel == 1
+        assert raw == 1000 * port
+    assert {port: sum(s[1] == port for s in samples) for port in PORTS} == {
+        0: 10,
+        1: 10,
+        2: 10,
+    }
+    # About one selection per sample plus an occasional early check
+    assert manager.selects - selects <= 2 * len(samples)
+    assert manager.selects == mux.selects
+
+
+def test_poll_skips_devices_not_due(manager):
+    manager.read_all()
+    while manager.poll() is None:
+        pass
+    selects = manager.selects
+    for _ in range(100):
+        manager.poll()
+    assert manager.selects - selects <= 4
+
+
+def test_stalled_device_does_not_starve_others(manager):
+    manager[1].enable(False)
+    manager[1].read_raw()  # Clear the cycle ready bit of the last conversion
+    ports = [port for _, port, _, _ in itertools.islice(manager.stream(), 20)]
+    assert (ports.count(0), ports.count(1), ports.count(2)) == (10, 0, 10)
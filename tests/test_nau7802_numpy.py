@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""Vectorized conversion and statistics tests."""
+
+import statistics
+from array import array
+
+import numpy as np
+import pytest
+from cedargrove_nau7802_numpy import (
+    FULL_SCALE,
+    STATS_DTYPE,
+    as_raw,
+    percent_full_scale,
+    summary,
+    to_mass,
+    window_stats,
+)
+
+VALUES = [0, 1, -1, 1000, -0x800000, 0x7FFFFF]
+
+
+def test_as_raw_shares_typed_buffers():
+    buf = array("i", VALUES)
+    raw = as_raw(buf)
+    assert raw.dtype == np.int32
+    assert list(raw) == VALUES
+    buf[0] = 5
+    assert raw[0] == 5  # A view, not a copy
+    assert list(as_raw(bytes(buf))) == [5] + VALUES[1:]
+    assert list(as_raw(np.array(VALUES, dtype=np.int64))) == VALUES
+
+
+def test_as_raw_unpacks_register_bytes():
+    packed = b"".join((v & 0xFFFFFF).to_bytes(3, "big") for v in VALUES)
+    assert list(as_raw(packed, packed=True)) == VALUES
+    with pytest.raises(ValueError):
+        as_raw(packed[:-1], packed=True)
+
+
+def test_to_mass_single_and_per_channel():
+    raw = np.array([1100, 900, -1000, -3000])
+    assert list(to_mass(raw, zero_offset=1000, ratio=0.5)) == [50, -50, -1000, -2000]
+    channels = np.array([1, 1, 2, 2])
+    mass = to_mass(raw, zero_offset=(1000, -2000), ratio=(0.5, 2.0), channels=channels)
+    assert list(mass) == [50, -50, 2000, -2000]
+
+
+def test_percent_full_scale():
+    assert list(percent_full_scale([0, FULL_SCALE, -FULL_SCALE])) == [0, 100, -100]
+
+
+def test_window_stats_matches_reference():
+    rng = np.random.default_rng(4)
+    values = rng.integers(-5000, 5000, 250)
+    stats = window_stats(values, window=100)
+    assert stats.dtype == STATS_DTYPE
+    assert len(stats) == 2  # Trailing partial window ignored
+    for i, entry in enumerate(stats):
+        window = [int(v) for v in values[i * 100 : (i + 1) * 100]]
+        assert entry["mean"] == pytest.approx(statistics.fmean(window))
+        assert entry["std"] == pytest.approx(statistics.pstdev(window))
+        assert (entry["min"], entry["max"]) == (min(window), max(window))
+    overlapping = window_stats(values, window=100, step=50)
+    assert len(overlapping) == 4
+    assert overlapping[2] == stats[1]
+
+
+def test_window_stats_edge_cases():
+    assert len(window_stats([1, 2], window=3)) == 0
+    with pytest.raises(ValueError):
+        window_stats([1, 2], window=0)
+
+
+def test_summary():
+    entry = summary([1, 2, 3, 4])
+    assert (entry["mean"], entry["min"], entry["max"]) == (2.5, 1, 4)
+    assert entry["std"] == pytest.approx(statistics.pstdev([1, 2, 3, 4]))
+    with pytest.raises(ValueError):
+        summary([])
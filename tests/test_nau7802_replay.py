@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+#
+# SPDX-License-Identifier: MIT
+"""ReplayNAU7802 tests with captures of the simulated device."""
+
+import itertools
+from array import array
+
+import pytest
+from cedargrove_fake_nau7802 import FakeI2C, FakeNAU7802Device
+from cedargrove_nau7802 import NAU7802
+from cedargrove_nau7802_capture import CaptureWriter
+from cedargrove_nau7802_replay import ReplayNAU7802
+from conftest import RATE
+
+SAMPLES = 24
+
+
+@pytest.fixture
+def capture(tmp_path):
+    """A dual channel capture of a noisy simulated device. Returns the path
+    and the streamed (timestamp_ns, channel, raw) samples."""
+    device = FakeNAU7802Device(inputs=(1000, -2000), noise=50, seed=7)
+    nau7802 = NAU7802(FakeI2C(device), active_channels=2)
+    nau7802.conversion_rate = RATE
+    samples = list(itertools.islice(nau7802.stream(samples_per_switch=6), SAMPLES))
+    path = tmp_path / "capture.bin"
+    with open(path, "wb") as file:
+        with CaptureWriter(file, rate=RATE, block_records=5) as writer:
+            for sample in samples:
+                writer.write(*sample)
+    return path, samples
+
+
+@pytest.mark.parametrize("make_buffer", [list, lambda n: array("i", n)])
+def test_replay_read_into(capture, make_buffer):
+    path, samples = capture
+    expected = [s[2] for s in samples if s[1] == 1]
+    replay = ReplayNAU7802(path, speed=None)
+    buf = make_buffer([0] * 8)
+    assert replay.read_into(buf) == (8, 0)
+    assert list(buf) == expected[:8]
+    assert replay.read_into(buf) == (len(expected) - 8, 0)
+    assert list(buf[: len(expected) - 8]) == expected[8:]
+    assert replay.finished
+
+
+def test_replay_read_raw_and_stream(capture):
+    path, samples = capture
+    replay = ReplayNAU7802(path, speed=None)
+    replay.strict = "SKIP"
+    first = [s[2] for s in samples if s[1] == 1][:3]
+    assert [replay.read_raw() for _ in range(3)] == first
+
+    replay = ReplayNAU7802(path, speed=None)
+    replayed = list(replay.stream(channels=(1,), samples_per_switch=4))
+    assert [raw for _, _, raw in replayed] == [s[2] for s in samples if s[1] == 1]
+
+
+def test_replay_validates_settings_like_the_driver(capture):
+    path, _ = capture
+    replay = ReplayNAU7802(path, speed=None)
+    replay.ldo_voltage = "2V7"
+    assert replay.ldo_voltage == "2V7"
+    replay.conversion_rate = RATE
+    replay.gain = 128
+    for name, value in (
+        ("ldo_voltage", "EXTERNAL"),
+        ("conversion_rate", 15),
+        ("conversion_rate", 80),  # Valid, but not the recorded rate
+        ("gain", 3),
+        ("gain", 64),
+        ("channel", 3),
+    ):
+        with pytest.raises(ValueError):
+            setattr(replay, name, value)
+    assert replay.calibrate("OFFSET")
+    with pytest.raises(ValueError):
+        replay.calibrate("EXTERNAL")
+    with pytest.raises(ValueError):
+        ReplayNAU7802(path, speed=0)
+
+
+def test_replay_rejects_unsupported_capture_rate(tmp_path):
+    path = tmp_path / "capture.bin"
+    with open(path, "wb") as file:
+        with CaptureWriter(file, rate=15) as writer:
+            writer.write(0, 1, 0)
+    with pytest.raises(ValueError):
+        ReplayNAU7802(path)